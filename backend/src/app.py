@@ -9,10 +9,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.openapi.utils import get_openapi
 
 from models.schemas import ChatRequest, ChatResponse, SessionRequest, NewSessionResponse
 from graphs.chat_graph import ChatGraph
 from services.session_service import SessionService
+from services.redis_session_service import RedisSessionService
 from config.settings import get_settings
 from streaming.orchestrator import StreamingOrchestrator
 
@@ -30,7 +32,7 @@ logger.info("Logging initialized. %s log level is set to: %s (%d)", __name__, lo
 
 # Global variables for dependency injection
 chat_graph: ChatGraph = None
-session_service: SessionService = None
+session_service: SessionService | RedisSessionService = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -53,9 +55,13 @@ async def lifespan(app: FastAPI):
         settings.validate_api_keys()
         logger.info("API key validation passed")
         
-        # Initialize session service
-        session_service = SessionService()
-        logger.info("Session service initialized")
+        # Initialize session service (Redis when configured, so workers share sessions)
+        if settings.database_url and settings.database_url.startswith(("redis://", "rediss://")):
+            session_service = RedisSessionService(settings.database_url)
+            logger.info("Session service initialized (Redis)")
+        else:
+            session_service = SessionService()
+            logger.info("Session service initialized (in-memory)")
         
         # Initialize chat graph with proper settings mapping
         model_config = settings.get_model_config()
@@ -109,6 +115,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def custom_openapi() -> Dict[str, Any]:
+    """Generate the OpenAPI schema once, merging in the model examples."""
+    if app.openapi_schema:
+        return app.openapi_schema
+    
+    # Examples are only needed for the docs, so load them on first use
+    from models.schemas_examples import EXAMPLES
+    
+    schema = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+    )
+    component_schemas = schema.get("components", {}).get("schemas", {})
+    for name, extra in EXAMPLES.items():
+        if name in component_schemas:
+            component_schemas[name].update(extra)
+    
+    app.openapi_schema = schema
+    return app.openapi_schema
+
+app.openapi = custom_openapi
+
 # Dependency injection
 def get_chat_graph() -> ChatGraph:
     """Dependency to get chat graph instance."""
@@ -116,7 +146,7 @@ def get_chat_graph() -> ChatGraph:
         raise HTTPException(status_code=500, detail="Chat graph not initialized")
     return chat_graph
 
-def get_session_service() -> SessionService:
+def get_session_service() -> SessionService | RedisSessionService:
     """Dependency to get session service instance."""
     if session_service is None:
         raise HTTPException(status_code=500, detail="Session service not initialized")
@@ -185,7 +215,7 @@ async def chat_stream(
         
         logger.info(f"Processing streaming chat for session: {request.session_id}")
         
-        async def generate_response() -> AsyncGenerator[str, None]:
+        async def generate_response() -> AsyncGenerator[bytes, None]:
             # Create streaming orchestrator
             orchestrator = StreamingOrchestrator(session_id=request.session_id)
             
@@ -204,11 +234,12 @@ async def chat_stream(
             async for chunk in orchestrator.stream_graph_execution(graph, initial_state, config):
                 yield chunk
             
-            # Store conversation in session (using accumulated response)
-            await session_svc.add_message(request.session_id, "user", request.user_prompt)
+            # Store the turn in session in one write (using accumulated response)
+            turn = [("user", request.user_prompt)]
             full_response = orchestrator.get_accumulated_response()
             if full_response:
-                await session_svc.add_message(request.session_id, "assistant", full_response)
+                turn.append(("assistant", full_response))
+            await session_svc.add_messages(request.session_id, turn)
         
         return StreamingResponse(
             generate_response(),
@@ -10,6 +10,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_anthropic import ChatAnthropic
 from langchain_aws import ChatBedrock
 from src.clients.capability_map import BedrockModelParameters
+import json
 import logging
 
 # Configure logging
@@ -483,7 +484,6 @@ class StreamingToolHandler(ToolHandler):
                         if isinstance(tool_call, dict):
                             args = tool_call.get('function', {}).get('arguments', {})
                             if isinstance(args, str):
-                                import json
                                 try:
                                     args = json.loads(args)
                                 except json.JSONDecodeError:
@@ -492,7 +492,6 @@ class StreamingToolHandler(ToolHandler):
                         elif hasattr(tool_call, 'function') and hasattr(tool_call.function, 'arguments'):
                             args = tool_call.function.arguments
                             if isinstance(args, str):
-                                import json
                                 try:
                                     args = json.loads(args)
                                 except json.JSONDecodeError:
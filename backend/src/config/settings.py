@@ -1,8 +1,8 @@
 # backend/config/settings.py
 import yaml
 from pathlib import Path
-from functools import lru_cache
-from typing import Optional, Dict, Any, List
+from functools import lru_cache, cached_property
+from typing import Optional, Dict, Any, Tuple
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 import logging
@@ -51,8 +51,11 @@ class Settings(BaseSettings):
         description="Comma-separated list of allowed CORS origins"
     )
     
-    # Database settings (for future use)
-    database_url: Optional[str] = Field(default=None, description="Database connection URL")
+    # Database settings
+    database_url: Optional[str] = Field(
+        default=None,
+        description="Database connection URL; a redis:// URL stores sessions in Redis"
+    )
     
     # Rate limiting
     rate_limit_enabled: bool = Field(default=False, description="Enable rate limiting")
@@ -127,10 +130,10 @@ class Settings(BaseSettings):
         except Exception as e:
             raise ValueError(f"Failed to load system prompt from {prompt_path}: {e}")
     
-    @property
-    def allowed_origins(self) -> List[str]:
-        """Get list of allowed CORS origins."""
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    @cached_property
+    def allowed_origins(self) -> Tuple[str, ...]:
+        """Get allowed CORS origins (parsed once per settings instance)."""
+        return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(","))
     
     def validate_api_keys(self) -> None:
         """Validate that required API keys are present based on configuration."""
@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
 from langgraph.graph import StateGraph
-from typing import Type, TypeVar, Generic, Optional, AsyncGenerator, Generator, Any
+from typing import Type, TypeVar, Generic, Optional, AsyncGenerator, Generator, Any, Mapping
 from components.shared_nodes import SharedNodes
-from pydantic import BaseModel
 from langgraph.checkpoint.memory import InMemorySaver
 
-S = TypeVar("S", bound=BaseModel)
+S = TypeVar("S", bound=Mapping[str, Any])
 
 class BaseGraph(Generic[S], ABC):
     """
@@ -14,7 +13,7 @@ class BaseGraph(Generic[S], ABC):
     Parameters
     ----------
     state_schema : Type[S]
-        Pydantic model that describes the shape of the state that will
+        TypedDict that describes the shape of the state that will
         flow through the graph.
     """
     def __init__(self, state_schema: Type[S]):
@@ -7,7 +7,7 @@ from graphs.base_graph import BaseGraph
 from components.assistants import MultiModalAsssitant
 from components.message_strategies import SingleImageStrategy
 from components.tools import FinanceTools
-from models.states import ChatState  # <-- Pydantic model
+from models.states import ChatState  # <-- TypedDict state
 
 # ------------------------------------------------------------------
 # 1.  Configure logger (optional but handy)
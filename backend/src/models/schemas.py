@@ -1,5 +1,6 @@
 # backend/src/models/schemas.py
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
@@ -7,14 +8,6 @@ class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     user_prompt: str = Field(..., min_length=1, max_length=2000, description="User's message to the financial advisor")
     session_id: str = Field(..., description="Session identifier for conversation continuity")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "user_prompt": "What's the current price of AAPL stock?",
-                "session_id": "123e4567-e89b-12d3-a456-426614174000"
-            }
-        }
 
 class ChatResponse(BaseModel):
     """Response model for chat streaming events."""
@@ -22,8 +15,12 @@ class ChatResponse(BaseModel):
     type: Literal[
         "assistant_response", 
         "tool_execution", 
+        "tool_result", 
         "thinking", 
         "error", 
+        "completion", 
+        "chain_start", 
+        "chain_end", 
         "done"
     ] = Field(
         ..., 
@@ -64,108 +61,43 @@ class ChatResponse(BaseModel):
         ]
     )
 
-    class Config:
-        # OpenAPI documentation
-        json_schema_extra = {
-            "examples": [
-                {
-                    "type": "assistant_response",
-                    "content": "Based on your portfolio, I recommend diversifying into tech stocks.",
-                    "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d",
-                    "timestamp": "2025-01-15T10:30:00Z",
-                    "metadata": {}
-                },
-                {
-                    "type": "tool_execution", 
-                    "content": "Analyzing market data...",
-                    "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d",
-                    "timestamp": "2025-01-15T10:30:00Z",
-                    "metadata": {"tool_name": "market_analyzer"}
-                },
-                {
-                    "type": "done",
-                    "content": "",
-                    "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d", 
-                    "timestamp": "2025-01-15T10:30:00Z",
-                    "metadata": {}
-                }
-            ]
-        }
-        
-        # Ensure proper serialization
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
-        
+    model_config = ConfigDict(
         # Help with OpenAPI generation
-        use_enum_values = True
-        validate_assignment = True
+        use_enum_values=True,
+        validate_assignment=True,
         
         # Schema customization for better codegen
-        title = "Chat Streaming Response"
-        description = "Server-sent event for chat streaming responses"
+        title="Chat Streaming Response",
+    )
 
-class StreamChunk(BaseModel):
-    """Model for streaming response chunks."""
-    type: str = Field(..., description="Type of chunk: assistant_response, tool_execution, thinking, error, done")
-    content: Optional[str] = Field(None, description="Chunk content")
-    session_id: Optional[str] = Field(None, description="Session identifier")
-    timestamp: Optional[datetime] = Field(None, description="Chunk timestamp")
-    details: Optional[Dict[str, Any]] = Field(None, description="Additional chunk details")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "type": "assistant_response",
-                "content": "Based on current market data, AAPL is trading at...",
-                "session_id": "123e4567-e89b-12d3-a456-426614174000",
-                "timestamp": "2025-01-15T10:30:00Z"
-            }
-        }
+@dataclass(slots=True)
+class StreamChunk:
+    """
+    Internal streaming response chunk. Built only by server code and never
+    parsed from user input, so it is a plain dataclass rather than a
+    validated Pydantic model.
+    """
+    type: str  # assistant_response, tool_execution, thinking, error, done
+    content: Optional[str] = None
+    session_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    details: Optional[Dict[str, Any]] = None  # Additional chunk details
 
 class SessionRequest(BaseModel):
     """Request model for session operations."""
     session_id: str = Field(..., description="Session identifier")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "session_id": "123e4567-e89b-12d3-a456-426614174000"
-            }
-        }
 
 class NewSessionResponse(BaseModel):
     """Response model for new session creation."""
     session_id: str = Field(..., description="Newly created session identifier")
     message: str = Field(..., description="Success message")
     created_at: Optional[datetime] = Field(None, description="Session creation timestamp")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "session_id": "123e4567-e89b-12d3-a456-426614174000",
-                "message": "Session created successfully",
-                "created_at": "2025-01-15T10:00:00Z"
-            }
-        }
 
 class SessionHistoryResponse(BaseModel):
     """Response model for session history."""
     session_id: str = Field(..., description="Session identifier")
     history: List[Dict[str, Any]] = Field(..., description="Conversation history")
     message_count: Optional[int] = Field(None, description="Total number of messages")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "session_id": "123e4567-e89b-12d3-a456-426614174000",
-                "history": [
-                    {"role": "user", "content": "What's AAPL price?", "timestamp": "2025-01-15T10:00:00Z"},
-                    {"role": "assistant", "content": "AAPL is trading at $185.25", "timestamp": "2025-01-15T10:00:05Z"}
-                ],
-                "message_count": 2
-            }
-        }
 
 class UserProfile(BaseModel):
     """User profile model for personalization."""
@@ -175,18 +107,6 @@ class UserProfile(BaseModel):
     annual_income: Optional[float] = Field(None, description="User's annual income")
     age: Optional[int] = Field(None, description="User's age")
     investment_experience: Optional[str] = Field(None, description="User's investment experience level")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "risk_tolerance": "moderate",
-                "investment_goals": ["retirement", "wealth_building"],
-                "portfolio": {"AAPL": 100, "TSLA": 50, "bonds": 200},
-                "annual_income": 75000.0,
-                "age": 35,
-                "investment_experience": "intermediate"
-            }
-        }
 
 class ErrorResponse(BaseModel):
     """Standard error response model."""
@@ -194,16 +114,6 @@ class ErrorResponse(BaseModel):
     message: str = Field(..., description="Error message")
     session_id: Optional[str] = Field(None, description="Session identifier if applicable")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "error": "SessionNotFound",
-                "message": "Session 123e4567-e89b-12d3-a456-426614174000 not found",
-                "session_id": "123e4567-e89b-12d3-a456-426614174000",
-                "timestamp": "2025-01-15T10:30:00Z"
-            }
-        }
 
 class HealthResponse(BaseModel):
     """Health check response model."""
@@ -211,13 +121,3 @@ class HealthResponse(BaseModel):
     service: str = Field(..., description="Service name")
     version: str = Field(..., description="Service version")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Health check timestamp")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "status": "healthy",
-                "service": "GAgent Financial Advisor API",
-                "version": "1.0.0",
-                "timestamp": "2025-01-15T10:30:00Z"
-            }
-        }
\ No newline at end of file
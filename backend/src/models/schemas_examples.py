@@ -0,0 +1,89 @@
+"""
+Example payloads for the API schemas.
+
+Kept out of the models so they are not attached to every class at import
+time; app.py merges them into the OpenAPI document the first time it is
+generated.
+"""
+
+EXAMPLES = {
+    "ChatRequest": {
+        "example": {
+            "user_prompt": "What's the current price of AAPL stock?",
+            "session_id": "123e4567-e89b-12d3-a456-426614174000"
+        }
+    },
+    "ChatResponse": {
+        "examples": [
+            {
+                "type": "assistant_response",
+                "content": "Based on your portfolio, I recommend diversifying into tech stocks.",
+                "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d",
+                "timestamp": "2025-01-15T10:30:00Z",
+                "metadata": {}
+            },
+            {
+                "type": "tool_execution", 
+                "content": "Analyzing market data...",
+                "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d",
+                "timestamp": "2025-01-15T10:30:00Z",
+                "metadata": {"tool_name": "market_analyzer"}
+            },
+            {
+                "type": "done",
+                "content": "",
+                "session_id": "9fb02f00-f46e-467d-87e2-24b66b62213d", 
+                "timestamp": "2025-01-15T10:30:00Z",
+                "metadata": {}
+            }
+        ]
+    },
+    "SessionRequest": {
+        "example": {
+            "session_id": "123e4567-e89b-12d3-a456-426614174000"
+        }
+    },
+    "NewSessionResponse": {
+        "example": {
+            "session_id": "123e4567-e89b-12d3-a456-426614174000",
+            "message": "Session created successfully",
+            "created_at": "2025-01-15T10:00:00Z"
+        }
+    },
+    "SessionHistoryResponse": {
+        "example": {
+            "session_id": "123e4567-e89b-12d3-a456-426614174000",
+            "history": [
+                {"role": "user", "content": "What's AAPL price?", "timestamp": "2025-01-15T10:00:00Z"},
+                {"role": "assistant", "content": "AAPL is trading at $185.25", "timestamp": "2025-01-15T10:00:05Z"}
+            ],
+            "message_count": 2
+        }
+    },
+    "UserProfile": {
+        "example": {
+            "risk_tolerance": "moderate",
+            "investment_goals": ["retirement", "wealth_building"],
+            "portfolio": {"AAPL": 100, "TSLA": 50, "bonds": 200},
+            "annual_income": 75000.0,
+            "age": 35,
+            "investment_experience": "intermediate"
+        }
+    },
+    "ErrorResponse": {
+        "example": {
+            "error": "SessionNotFound",
+            "message": "Session 123e4567-e89b-12d3-a456-426614174000 not found",
+            "session_id": "123e4567-e89b-12d3-a456-426614174000",
+            "timestamp": "2025-01-15T10:30:00Z"
+        }
+    },
+    "HealthResponse": {
+        "example": {
+            "status": "healthy",
+            "service": "GAgent Financial Advisor API",
+            "version": "1.0.0",
+            "timestamp": "2025-01-15T10:30:00Z"
+        }
+    },
+}
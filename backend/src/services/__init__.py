@@ -1,5 +1,7 @@
 from .session_service import SessionService
+from .redis_session_service import RedisSessionService
 
 __all__ = [
-    "SessionService"
+    "SessionService",
+    "RedisSessionService"
 ]
\ No newline at end of file
@@ -0,0 +1,277 @@
+# backend/src/services/redis_session_service.py
+import json
+import asyncio
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from utils.time_cache import now_ms
+from .session_service import HISTORY_LIMIT, get_formatter, new_session_id
+
+logger = logging.getLogger(__name__)
+
+# Appends messages only if the session still exists, so a write queued
+# before delete_session cannot bring the session back
+_APPEND_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], unpack(ARGV, 4))
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[1]), -1)
+redis.call('HSET', KEYS[1], 'last_activity', ARGV[2])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return 1
+"""
+
+DEFAULT_USER_PROFILE = {
+    "risk_tolerance": "moderate",
+    "investment_goals": [],
+    "portfolio": {}
+}
+
+
+class RedisSessionService:
+    """
+    Redis-backed drop-in for SessionService, so sessions are shared by
+    every API worker instead of living on one process's heap.
+
+    Layout per session:
+        {prefix}{id}          hash   id, created_at, last_activity (epoch ms)
+        {prefix}{id}:msgs     list   JSON-encoded messages, oldest first
+        {prefix}{id}:profile  hash   user profile field -> JSON value
+        {prefix}index         zset   session id scored by last_activity
+
+    Messages added within ``flush_window_ms`` of each other are written
+    in a single pipeline round trip, in the order they were added. Each
+    append checks that the session still exists in the same script, and
+    each message list is trimmed to its last ``history_limit`` entries
+    as it is written.
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = "sess:", flush_window_ms: float = 5,
+                 history_limit: int = HISTORY_LIMIT):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(
+                "RedisSessionService requires the 'redis' package (pip install redis)"
+            ) from e
+
+        self._client = redis.from_url(redis_url, decode_responses=True)
+        self._prefix = key_prefix
+        self._index_key = f"{key_prefix}index"
+        self._flush_window = flush_window_ms / 1000
+        self._history_limit = history_limit
+        self._append_script = self._client.register_script(_APPEND_SCRIPT)
+        self._pending: List[Tuple[str, List[str], int, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _key(self, session_id: str) -> str:
+        return f"{self._prefix}{session_id}"
+
+    async def create_session(self) -> str:
+        """Create a new chat session and return session ID."""
+        session_id = new_session_id()
+        key = self._key(session_id)
+        created_ms = now_ms()
+
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(key, mapping={
+            "id": session_id,
+            "created_at": created_ms,
+            "last_activity": created_ms
+        })
+        pipe.hset(f"{key}:profile", mapping={
+            field: json.dumps(value) for field, value in DEFAULT_USER_PROFILE.items()
+        })
+        pipe.zadd(self._index_key, {session_id: created_ms})
+        await pipe.execute()
+
+        logger.info(f"Created session: {session_id}")
+        return session_id
+
+    async def session_exists(self, session_id: str) -> bool:
+        """Check if a session exists."""
+        return bool(await self._client.exists(self._key(session_id)))
+
+    async def delete_session(self, session_id: str) -> None:
+        """Delete a session."""
+        key = self._key(session_id)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(key, f"{key}:msgs", f"{key}:profile")
+        pipe.zrem(self._index_key, session_id)
+        deleted, _ = await pipe.execute()
+        if not deleted:
+            raise ValueError(f"Session {session_id} not found")
+
+        logger.info(f"Deleted session: {session_id}")
+
+    async def get_session_config(self, session_id: str) -> Dict[str, Any]:
+        """Get configuration for LangGraph (thread_id, etc.)."""
+        if not await self.session_exists(session_id):
+            raise ValueError(f"Session {session_id} not found")
+
+        return {
+            "configurable": {
+                "thread_id": session_id,
+                "user_id": "demo_user"
+            }
+        }
+
+    async def add_message(self, session_id: str, role: str, content: str) -> None:
+        """Add a message to session history."""
+        await self._append(session_id, [(role, content)])
+
+        logger.debug("Added %s message to session %s", role, session_id)
+
+    async def add_messages(self, session_id: str, messages: List[Tuple[str, str]]) -> None:
+        """
+        Add several (role, content) messages to session history at once.
+        They are queued alongside single messages, so appends to a session
+        land in call order, and are written by one script call.
+        """
+        if not messages:
+            if not await self.session_exists(session_id):
+                raise ValueError(f"Session {session_id} not found")
+            return
+
+        await self._append(session_id, messages)
+
+        logger.debug("Added %d messages to session %s", len(messages), session_id)
+
+    async def _append(self, session_id: str, messages: List[Tuple[str, str]]) -> None:
+        """Queue messages for the next flush and wait until they are written."""
+        ts_ms = now_ms()
+        timestamp = get_formatter().format(ts_ms)
+        encoded = [
+            json.dumps({"role": role, "content": content, "timestamp": timestamp})
+            for role, content in messages
+        ]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((session_id, encoded, ts_ms, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending())
+        await future
+
+    async def _flush_pending(self) -> None:
+        """Write all messages queued during the flush window in one pipeline."""
+        await asyncio.sleep(self._flush_window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        pipe = self._client.pipeline(transaction=False)
+        for session_id, messages, ts_ms, _ in batch:
+            key = self._key(session_id)
+            await self._append_script(
+                keys=[key, f"{key}:msgs", self._index_key],
+                args=[self._history_limit, ts_ms, session_id, *messages],
+                client=pipe
+            )
+
+        try:
+            results = await pipe.execute()
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (session_id, *_, future), appended in zip(batch, results):
+            if future.done():
+                continue
+            if appended:
+                future.set_result(None)
+            else:
+                future.set_exception(ValueError(f"Session {session_id} not found"))
+
+    async def get_session_history(self, session_id: str) -> Tuple[Dict[str, Any], ...]:
+        """Get conversation history for a session."""
+        key = self._key(session_id)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.lrange(f"{key}:msgs", 0, -1)
+        exists, messages = await pipe.execute()
+        if not exists:
+            raise ValueError(f"Session {session_id} not found")
+
+        return tuple(json.loads(message) for message in messages)
+
+    async def update_user_profile(self, session_id: str, profile_updates: Dict[str, Any]) -> None:
+        """Update user profile information for personalization."""
+        if not await self.session_exists(session_id):
+            raise ValueError(f"Session {session_id} not found")
+
+        key = self._key(session_id)
+        ts_ms = now_ms()
+        # One field per profile key, so an update is a single HSET rather
+        # than a read-modify-write of the whole profile
+        pipe = self._client.pipeline(transaction=True)
+        pipe.hset(f"{key}:profile", mapping={
+            field: json.dumps(value) for field, value in profile_updates.items()
+        })
+        pipe.hset(key, "last_activity", ts_ms)
+        pipe.zadd(self._index_key, {session_id: ts_ms})
+        await pipe.execute()
+
+        logger.info(f"Updated user profile for session {session_id}")
+
+    async def get_user_profile(self, session_id: str) -> Dict[str, Any]:
+        """Get user profile for personalization."""
+        if not await self.session_exists(session_id):
+            raise ValueError(f"Session {session_id} not found")
+
+        profile = await self._client.hgetall(f"{self._key(session_id)}:profile")
+        return {field: json.loads(value) for field, value in profile.items()}
+
+    async def cleanup(self) -> None:
+        """Flush queued writes and close the Redis connection. Stored sessions are kept."""
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._client.aclose()
+
+        logger.info("Closed Redis session store connection")
+
+    async def get_session_stats(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get statistics about current sessions (for monitoring).
+        Sessions are listed most recently active first from the index.
+        """
+        if limit == 0:
+            # ZREVRANGE's stop is inclusive, so offset + limit - 1 would
+            # wrap around to -1 and list every session
+            return {
+                "total_sessions": await self._client.zcard(self._index_key),
+                "sessions": []
+            }
+
+        stop = -1 if limit is None else offset + limit - 1
+        pipe = self._client.pipeline(transaction=False)
+        pipe.zcard(self._index_key)
+        pipe.zrevrange(self._index_key, offset, stop)
+        total, session_ids = await pipe.execute()
+
+        pipe = self._client.pipeline(transaction=False)
+        for session_id in session_ids:
+            key = self._key(session_id)
+            pipe.hmget(key, "created_at", "last_activity")
+            pipe.llen(f"{key}:msgs")
+        results = await pipe.execute()
+
+        formatter = get_formatter()
+        sessions = []
+        for session_id, (created_at, last_activity), message_count in zip(
+            session_ids, results[::2], results[1::2]
+        ):
+            if created_at is None:
+                continue  # Deleted between the two pipelines
+            sessions.append({
+                "id": session_id,
+                "created_at": formatter.format(int(created_at)),
+                "last_activity": formatter.format(int(last_activity)),
+                "message_count": message_count
+            })
+
+        return {
+            "total_sessions": total,
+            "sessions": sessions
+        }
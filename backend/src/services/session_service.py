@@ -1,56 +1,206 @@
 # backend/src/services/session_service.py
-import uuid
-import asyncio
-from typing import Dict, List, Any, Optional
+import os
+import sys
+import heapq
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import logging
 
+from utils.time_cache import now_ms
+
 logger = logging.getLogger(__name__)
 
+_MS_PER_DAY = 86_400_000
+
+
+class IsoTsFormatter:
+    """
+    Formats epoch-millisecond timestamps as ISO-8601 UTC strings.
+    The date portion is cached for the current UTC day so only the
+    time-of-day suffix is built per call. Not thread-safe; use
+    one instance per thread (see get_formatter).
+    """
+
+    __slots__ = ("_cached_day_epoch", "_cached_date_str")
+
+    def __init__(self):
+        self._cached_day_epoch = -1
+        self._cached_date_str = ""
+
+    def format(self, ts_ms: int) -> str:
+        """Format epoch milliseconds as YYYY-MM-DDTHH:MM:SS.mmm+00:00."""
+        day_epoch, ms_in_day = divmod(ts_ms, _MS_PER_DAY)
+        if day_epoch != self._cached_day_epoch:
+            day = datetime.fromtimestamp(day_epoch * 86_400, tz=timezone.utc)
+            self._cached_date_str = day.strftime("%Y-%m-%dT")
+            self._cached_day_epoch = day_epoch
+
+        seconds, millis = divmod(ms_in_day, 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{self._cached_date_str}{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}+00:00"
+
+
+_formatter_local = threading.local()
+
+
+def get_formatter() -> IsoTsFormatter:
+    """Get the IsoTsFormatter for the current thread."""
+    formatter = getattr(_formatter_local, "formatter", None)
+    if formatter is None:
+        formatter = _formatter_local.formatter = IsoTsFormatter()
+    return formatter
+
+
+_UUID_POOL_BYTES = 4096
+
+
+class _UUIDPool:
+    """
+    Hands out random version-4 UUID strings sliced from a pooled
+    os.urandom buffer, so one syscall serves 256 IDs. Not thread-safe;
+    session creation runs on the event loop thread.
+    """
+
+    __slots__ = ("_buf", "_pos")
+
+    def __init__(self):
+        self._buf = b""
+        self._pos = 0
+
+    def next(self) -> str:
+        """Get the next UUID4 string."""
+        if self._pos >= len(self._buf):
+            self._buf = os.urandom(_UUID_POOL_BYTES)
+            self._pos = 0
+        raw = bytearray(self._buf[self._pos:self._pos + 16])
+        self._pos += 16
+
+        # Set the version (4) and RFC 4122 variant bits
+        raw[6] = (raw[6] & 0x0F) | 0x40
+        raw[8] = (raw[8] & 0x3F) | 0x80
+        h = raw.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+_session_ids = _UUIDPool()
+
+
+def new_session_id() -> str:
+    """Generate a new random session ID."""
+    return _session_ids.next()
+
+
+class _Session:
+    """In-memory record for a single chat session."""
+
+    __slots__ = (
+        "id",
+        "created_at",
+        "last_activity",
+        "messages",
+        "history_version",
+        "history_snapshot",
+        "user_profile",
+    )
+
+    def __init__(self, session_id: str, created_ms: int, history_limit: int):
+        self.id = session_id
+        self.created_at = created_ms
+        self.last_activity = created_ms
+        # Oldest messages drop off once the limit is reached
+        self.messages: deque[Dict[str, Any]] = deque(maxlen=history_limit)
+        self.history_version = 0
+        self.history_snapshot: Tuple[Tuple[Dict[str, Any], ...], int] = ((), 0)
+        self.user_profile: Dict[str, Any] = {
+            "risk_tolerance": "moderate",
+            "investment_goals": [],
+            "portfolio": {}
+        }
+
+
+# Canonical role strings, so stored messages share one copy of each role
+# rather than holding the string each request was decoded into
+_ROLES = {role: sys.intern(role) for role in ("user", "assistant", "system", "tool")}
+
+
+def _intern_role(role: str) -> str:
+    """Get the shared copy of a role string."""
+    interned = _ROLES.get(role)
+    return interned if interned is not None else sys.intern(role)
+
+
+_SHARD_COUNT = 16
+_SHARD_MASK = _SHARD_COUNT - 1
+MAX_SESSIONS = 10_000
+HISTORY_LIMIT = 50
+
+
 class SessionService:
     """
     Service to manage chat sessions and conversation history.
     For demo purposes, using in-memory storage. In production,
     this would use a database like Redis or PostgreSQL.
+
+    Sessions are spread across a fixed number of shards keyed by
+    ``hash(session_id)``. No operation awaits partway through, so each
+    runs to completion on the event loop and none needs a lock.
+
+    Each shard is kept in least-recently-used order and holds at most
+    ``max_sessions / 16`` sessions; the least recently used session in
+    a full shard is evicted when a new one is created there.
+
+    Each session keeps only its last ``history_limit`` messages.
     """
     
-    def __init__(self):
+    def __init__(self, max_sessions: int = MAX_SESSIONS, history_limit: int = HISTORY_LIMIT):
         # In-memory storage for demo
-        self._sessions: Dict[str, Dict[str, Any]] = {}
-        self._lock = asyncio.Lock()
+        self._shards: List[OrderedDict[str, _Session]] = [
+            OrderedDict() for _ in range(_SHARD_COUNT)
+        ]
+        self._max_per_shard = max(1, max_sessions // _SHARD_COUNT)
+        self._history_limit = history_limit
+    
+    def _shard(self, session_id: str) -> OrderedDict[str, _Session]:
+        """Get the shard that owns a session ID."""
+        return self._shards[hash(session_id) & _SHARD_MASK]
+    
+    def _get_session(self, session_id: str) -> _Session:
+        """Look up a session and mark it as most recently used."""
+        shard = self._shard(session_id)
+        session = shard.get(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+        shard.move_to_end(session_id)
+        session.last_activity = now_ms()
+        return session
     
     async def create_session(self) -> str:
         """Create a new chat session and return session ID."""
-        session_id = str(uuid.uuid4())
+        session_id = new_session_id()
         
-        async with self._lock:
-            self._sessions[session_id] = {
-                "id": session_id,
-                "created_at": datetime.now(timezone.utc),
-                "last_activity": datetime.now(timezone.utc),
-                "messages": [],
-                "user_profile": {
-                    "risk_tolerance": "moderate",
-                    "investment_goals": [],
-                    "portfolio": {}
-                }
-            }
+        shard = self._shard(session_id)
+        if len(shard) >= self._max_per_shard:
+            evicted_id, _ = shard.popitem(last=False)
+            logger.info(f"Evicted least recently used session: {evicted_id}")
+        
+        shard[session_id] = _Session(session_id, now_ms(), self._history_limit)
         
         logger.info(f"Created session: {session_id}")
         return session_id
     
     async def session_exists(self, session_id: str) -> bool:
         """Check if a session exists."""
-        async with self._lock:
-            return session_id in self._sessions
+        return session_id in self._shard(session_id)
     
     async def delete_session(self, session_id: str) -> None:
         """Delete a session."""
-        async with self._lock:
-            if session_id not in self._sessions:
-                raise ValueError(f"Session {session_id} not found")
-            
-            del self._sessions[session_id]
+        if self._shard(session_id).pop(session_id, None) is None:
+            raise ValueError(f"Session {session_id} not found")
         
         logger.info(f"Deleted session: {session_id}")
     
@@ -68,69 +218,83 @@ class SessionService:
     
     async def add_message(self, session_id: str, role: str, content: str) -> None:
         """Add a message to session history."""
-        if not await self.session_exists(session_id):
-            raise ValueError(f"Session {session_id} not found")
-        
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        await self.add_messages(session_id, [(role, content)])
+    
+    async def add_messages(self, session_id: str, messages: List[Tuple[str, str]]) -> None:
+        """
+        Add several (role, content) messages to session history at once.
+        The session is looked up and its history invalidated once for the
+        whole batch, and the messages share one timestamp.
+        """
+        session = self._get_session(session_id)
+        timestamp = get_formatter().format(session.last_activity)
         
-        async with self._lock:
-            self._sessions[session_id]["messages"].append(message)
-            self._sessions[session_id]["last_activity"] = datetime.now(timezone.utc)
+        session.messages.extend(
+            {"role": _intern_role(role), "content": content, "timestamp": timestamp}
+            for role, content in messages
+        )
+        session.history_version += 1
         
-        logger.debug(f"Added {role} message to session {session_id}")
+        logger.debug("Added %d messages to session %s", len(messages), session_id)
     
-    async def get_session_history(self, session_id: str) -> List[Dict[str, Any]]:
-        """Get conversation history for a session."""
-        if not await self.session_exists(session_id):
-            raise ValueError(f"Session {session_id} not found")
-        
-        async with self._lock:
-            return self._sessions[session_id]["messages"].copy()
+    async def get_session_history(self, session_id: str) -> Tuple[Dict[str, Any], ...]:
+        """
+        Get conversation history for a session as an immutable snapshot.
+        The snapshot is rebuilt only when messages were added since the
+        last read, so repeated reads of an unchanged history are O(1).
+        """
+        session = self._get_session(session_id)
+        snapshot, version = session.history_snapshot
+        if version != session.history_version:
+            snapshot = tuple(session.messages)
+            session.history_snapshot = (snapshot, session.history_version)
+        return snapshot
     
     async def update_user_profile(self, session_id: str, profile_updates: Dict[str, Any]) -> None:
         """Update user profile information for personalization."""
-        if not await self.session_exists(session_id):
-            raise ValueError(f"Session {session_id} not found")
-        
-        async with self._lock:
-            current_profile = self._sessions[session_id]["user_profile"]
-            current_profile.update(profile_updates)
-            self._sessions[session_id]["last_activity"] = datetime.now(timezone.utc)
+        self._get_session(session_id).user_profile.update(profile_updates)
         
         logger.info(f"Updated user profile for session {session_id}")
     
     async def get_user_profile(self, session_id: str) -> Dict[str, Any]:
         """Get user profile for personalization."""
-        if not await self.session_exists(session_id):
-            raise ValueError(f"Session {session_id} not found")
-        
-        async with self._lock:
-            return self._sessions[session_id]["user_profile"].copy()
+        return self._get_session(session_id).user_profile.copy()
     
     async def cleanup(self) -> None:
         """Cleanup resources (for production, close DB connections, etc.)."""
-        async with self._lock:
-            session_count = len(self._sessions)
-            self._sessions.clear()
+        session_count = 0
+        for shard in self._shards:
+            session_count += len(shard)
+            shard.clear()
         
         logger.info(f"Cleaned up {session_count} sessions")
     
-    async def get_session_stats(self) -> Dict[str, Any]:
-        """Get statistics about current sessions (for monitoring)."""
-        async with self._lock:
-            return {
-                "total_sessions": len(self._sessions),
-                "sessions": [
-                    {
-                        "id": session_id,
-                        "created_at": session_data["created_at"].isoformat(),
-                        "last_activity": session_data["last_activity"].isoformat(),
-                        "message_count": len(session_data["messages"])
-                    }
-                    for session_id, session_data in self._sessions.items()
-                ]
-            }
\ No newline at end of file
+    async def get_session_stats(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get statistics about current sessions (for monitoring).
+        Sessions are listed most recently active first; ``offset`` and
+        ``limit`` page through them without visiting the whole store.
+        A session's ``last_activity`` is the last time it was read or
+        written, the same recency that decides eviction.
+        """
+        formatter = get_formatter()
+        # Each shard is already ordered by last activity, so merging the
+        # shards newest-first only touches the sessions being returned.
+        by_activity = heapq.merge(
+            *(reversed(shard.values()) for shard in self._shards),
+            key=attrgetter("last_activity"),
+            reverse=True,
+        )
+        stop = None if limit is None else offset + limit
+        return {
+            "total_sessions": sum(len(shard) for shard in self._shards),
+            "sessions": [
+                {
+                    "id": session.id,
+                    "created_at": formatter.format(session.created_at),
+                    "last_activity": formatter.format(session.last_activity),
+                    "message_count": len(session.messages)
+                }
+                for session in islice(by_activity, offset, stop)
+            ]
+        }
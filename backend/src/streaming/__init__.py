@@ -10,9 +10,12 @@ from .processors import (
     ProcessorRegistry
 )
 from .events import (
+    EventType,
     StreamEvent,
+    ChainStartEvent,
     AssistantResponseEvent,
     ToolExecutionEvent,
+    ToolResultEvent,
     ThinkingEvent,
     ErrorEvent,
     EventEmitter
@@ -26,9 +29,12 @@ __all__ = [
     "ToolsChunkProcessor",
     "DefaultChunkProcessor",
     "ProcessorRegistry",
+    "EventType",
     "StreamEvent",
+    "ChainStartEvent",
     "AssistantResponseEvent",
     "ToolExecutionEvent", 
+    "ToolResultEvent",
     "ThinkingEvent",
     "ErrorEvent",
     "EventEmitter"
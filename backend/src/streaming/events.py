@@ -1,18 +1,38 @@
 """
 Enhanced event types and emitters for streaming responses with better LangChain integration.
 """
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, AsyncGenerator, List, Union
-import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Union
+import orjson
+import itertools
 import logging
+import time
 from datetime import datetime
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# How long, in seconds, an emitter reuses its formatted timestamp
+_TIMESTAMP_TTL = 0.005
+
+
+@lru_cache(maxsize=256)
+def _sse_prefix(event_type: str, session_id: Optional[str]) -> bytes:
+    """Build the constant head of an SSE frame for an event type and session."""
+    return (
+        b'data: {"type":' + orjson.dumps(event_type)
+        + b',"session_id":' + orjson.dumps(session_id) + b","
+    )
+
 
 class EventType(Enum):
-    """Enumeration of event types for better type safety."""
+    """
+    Enumeration of event types for better type safety.
+    The string values are the SSE wire format: the frontend client and
+    ChatResponse dispatch on these names, so they are not replaced with
+    integer codes.
+    """
     ASSISTANT_RESPONSE = "assistant_response"
     TOOL_EXECUTION = "tool_execution" 
     TOOL_RESULT = "tool_result"
@@ -23,19 +43,34 @@ class EventType(Enum):
     CHAIN_END = "chain_end"
 
 
-@dataclass
+# Plain string for call sites that build events at runtime, so emitting
+# doesn't pay for an Enum member lookup
+_COMPLETION_TYPE = EventType.COMPLETION.value
+
+
+@dataclass(slots=True)
 class StreamEvent:
     """Base class for all streaming events with enhanced functionality."""
     content: str
     type: str = ""  # Made this have a default value
     session_id: Optional[str] = None
     timestamp: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
     sequence_id: Optional[int] = None
 
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow().isoformat()
+    def _build_metadata(self) -> Dict[str, Any]:
+        """
+        Build the metadata object sent on the wire. Subclasses add their
+        own fields here, at encode time, so constructing an event doesn't
+        allocate and fill a dict that may never be serialized.
+        """
+        return self.metadata or {}
+
+    def _with_metadata(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge caller-supplied metadata under a subclass's own fields."""
+        if self.metadata:
+            return {**self.metadata, **fields}
+        return fields
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary for JSON serialization."""
@@ -44,115 +79,107 @@ class StreamEvent:
             "content": self.content,
             "session_id": self.session_id,
             "timestamp": self.timestamp,
-            "metadata": self.metadata,
+            "metadata": self._build_metadata(),
             "sequence_id": self.sequence_id
         }
 
-    def to_sse_format(self) -> str:
-        """Convert event to Server-Sent Events format."""
-        return f"data: {json.dumps(self.to_dict())}\n\n"
+    def to_sse_format(self) -> bytes:
+        """
+        Convert event to Server-Sent Events format.
+        type and session_id are fixed for a stream, so that part of the
+        frame is cached and only the changing fields are encoded.
+        """
+        body = orjson.dumps({
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "metadata": self._build_metadata(),
+            "sequence_id": self.sequence_id
+        })
+        # Drop the body's opening brace; the cached prefix supplies it
+        return _sse_prefix(self.type, self.session_id) + body[1:] + b"\n\n"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChainStartEvent(StreamEvent):
     """Event for starting a chain of operations."""
+    type: str = EventType.CHAIN_START.value
     chain_type: Optional[str] = None
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.CHAIN_START.value
+    def _build_metadata(self) -> Dict[str, Any]:
         if self.chain_type:
-            self.metadata["chain_type"] = self.chain_type
+            return self._with_metadata({"chain_type": self.chain_type})
+        return self.metadata or {}
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantResponseEvent(StreamEvent):
     """Event for assistant text responses with reasoning tracking."""
+    type: str = EventType.ASSISTANT_RESPONSE.value
     is_intermediate: bool = False
     reasoning_step: Optional[str] = None
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.ASSISTANT_RESPONSE.value
-        
-        self.metadata.update({
+    def _build_metadata(self) -> Dict[str, Any]:
+        return self._with_metadata({
             "is_intermediate": self.is_intermediate,
             "reasoning_step": self.reasoning_step
         })
 
 
-@dataclass  
+@dataclass(slots=True)
 class ToolExecutionEvent(StreamEvent):
     """Event for tool execution notifications."""
+    type: str = EventType.TOOL_EXECUTION.value
     tool_name: Optional[str] = None
     execution_status: str = "starting"  # starting, running, completed, failed
     tool_input: Optional[Dict[str, Any]] = None
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.TOOL_EXECUTION.value
-            
-        self.metadata.update({
+    def _build_metadata(self) -> Dict[str, Any]:
+        return self._with_metadata({
             "tool_name": self.tool_name,
             "tool_input": self.tool_input,
             "execution_status": self.execution_status
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultEvent(StreamEvent):
     """Event for tool execution results."""
+    type: str = EventType.TOOL_RESULT.value
     result: Any = None
     success: bool = True
     error_message: Optional[str] = None
     tool_name: Optional[str] = None
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.TOOL_RESULT.value
-            
-        self.metadata.update({
+    def _build_metadata(self) -> Dict[str, Any]:
+        return self._with_metadata({
             "tool_name": self.tool_name,
             "success": self.success,
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            # Complex results are sent as-is, anything else as a string
+            "result": self.result if isinstance(self.result, (dict, list)) else str(self.result)
         })
-        
-        # Store result in metadata for complex objects
-        if isinstance(self.result, (dict, list)):
-            self.metadata["result"] = self.result
-        else:
-            self.metadata["result"] = str(self.result)
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingEvent(StreamEvent):
     """Event for processing/thinking notifications."""
+    type: str = EventType.THINKING.value
     thinking_type: str = "processing"  # processing, analyzing, planning, etc.
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.THINKING.value
-        self.metadata["thinking_type"] = self.thinking_type
+    def _build_metadata(self) -> Dict[str, Any]:
+        return self._with_metadata({"thinking_type": self.thinking_type})
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorEvent(StreamEvent):
     """Event for error notifications."""
+    type: str = EventType.ERROR.value
     error_code: Optional[str] = None
     error_type: Optional[str] = None
     recoverable: bool = True
     
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.type:
-            self.type = EventType.ERROR.value
-            
-        self.metadata.update({
+    def _build_metadata(self) -> Dict[str, Any]:
+        return self._with_metadata({
             "error_code": self.error_code,
             "error_type": self.error_type,
             "recoverable": self.recoverable
@@ -164,58 +191,70 @@ class EventEmitter:
     
     def __init__(self, session_id: Optional[str] = None):
         self.session_id = session_id
-        self.sequence_counter = 0
+        self._sequence = itertools.count(1)
         self.active_chains: Dict[str, Any] = {}
+        self._ts_cache: Tuple[float, str] = (float("-inf"), "")
         
     def _get_next_sequence_id(self) -> int:
         """Get the next sequence ID for ordering events."""
-        self.sequence_counter += 1
-        return self.sequence_counter
+        return next(self._sequence)
     
-    async def emit(self, event: StreamEvent) -> AsyncGenerator[str, None]:
-        """Emit a single event with automatic session and sequence handling."""
+    def _get_timestamp(self) -> str:
+        """Get the current ISO timestamp, reformatted at most once per TTL window."""
+        checked_at, timestamp = self._ts_cache
+        now = time.monotonic()
+        if now - checked_at > _TIMESTAMP_TTL:
+            timestamp = datetime.utcnow().isoformat()
+            self._ts_cache = (now, timestamp)
+        return timestamp
+    
+    async def emit(self, event: StreamEvent) -> Tuple[StreamEvent, bytes]:
+        """
+        Emit a single event with automatic session and sequence handling.
+        Returns the event together with its SSE frame so consumers can read
+        fields off the event instead of parsing the frame back.
+        """
         if self.session_id and not event.session_id:
             event.session_id = self.session_id
             
         if event.sequence_id is None:
             event.sequence_id = self._get_next_sequence_id()
+
+        if event.timestamp is None:
+            event.timestamp = self._get_timestamp()
         
-        logger.debug(f"Emitting event: {event.type} (seq: {event.sequence_id})")
-        yield event.to_sse_format()
+        logger.debug("Emitting event: %s (seq: %s)", event.type, event.sequence_id)
+        return event, event.to_sse_format()
 
     async def emit_chain_start(self, content: str = "Starting analysis...", 
-                              chain_type: str = "langchain", **kwargs) -> AsyncGenerator[str, None]:
+                              chain_type: str = "langchain", **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit a chain start event."""
         event = ChainStartEvent(content=content, chain_type=chain_type, 
                                session_id=self.session_id, **kwargs)
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
     async def emit_thinking(self, content: str = "Processing your request...", 
-                           thinking_type: str = "processing", **kwargs) -> AsyncGenerator[str, None]:
+                           thinking_type: str = "processing", **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit a thinking/processing event."""
         event = ThinkingEvent(content=content, thinking_type=thinking_type, 
                              session_id=self.session_id, **kwargs)
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
     async def emit_assistant_response(self, content: str, is_intermediate: bool = False,
-                                    reasoning_step: Optional[str] = None, **kwargs) -> AsyncGenerator[str, None]:
+                                    reasoning_step: Optional[str] = None, **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit an assistant response event."""
         event = AssistantResponseEvent(
             content=content, 
-            type=EventType.ASSISTANT_RESPONSE.value,
             is_intermediate=is_intermediate,
             reasoning_step=reasoning_step,
             session_id=self.session_id, 
             **kwargs
         )
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
     async def emit_tool_execution(self, tool_name: str, content: str, 
                                  tool_input: Optional[Dict[str, Any]] = None,
-                                 execution_status: str = "starting", **kwargs) -> AsyncGenerator[str, None]:
+                                 execution_status: str = "starting", **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit a tool execution event."""
         event = ToolExecutionEvent(
             content=content, 
@@ -225,12 +264,11 @@ class EventEmitter:
             session_id=self.session_id, 
             **kwargs
         )
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
     async def emit_tool_result(self, tool_name: str, result: Any, content: str = "",
                               success: bool = True, error_message: Optional[str] = None, 
-                              **kwargs) -> AsyncGenerator[str, None]:
+                              **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit a tool result event."""
         if not content:
             content = f"Tool {tool_name} {'completed successfully' if success else 'failed'}"
@@ -244,12 +282,11 @@ class EventEmitter:
             session_id=self.session_id,
             **kwargs
         )
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
     async def emit_error(self, content: str, error_code: Optional[str] = None,
                         error_type: Optional[str] = None, recoverable: bool = True, 
-                        **kwargs) -> AsyncGenerator[str, None]:
+                        **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit an error event."""
         event = ErrorEvent(
             content=content, 
@@ -259,16 +296,14 @@ class EventEmitter:
             session_id=self.session_id, 
             **kwargs
         )
-        async for chunk in self.emit(event):
-            yield chunk
+        return await self.emit(event)
 
-    async def emit_completion(self, content: str = "Request completed", **kwargs) -> AsyncGenerator[str, None]:
+    async def emit_completion(self, content: str = "Request completed", **kwargs) -> Tuple[StreamEvent, bytes]:
         """Emit a completion event."""
         event = StreamEvent(
             content=content,
-            type=EventType.COMPLETION.value, 
+            type=_COMPLETION_TYPE, 
             session_id=self.session_id, 
             **kwargs
         )
-        async for chunk in self.emit(event):
-            yield chunk
\ No newline at end of file
+        return await self.emit(event)
\ No newline at end of file
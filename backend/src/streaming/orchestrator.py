@@ -3,7 +3,7 @@ Main streaming orchestrator that coordinates graph streaming.
 """
 from typing import Dict, Any, AsyncGenerator, Optional
 import logging
-from .events import EventEmitter
+from .events import EventEmitter, StreamEvent, AssistantResponseEvent
 from .processors import ProcessorRegistry
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ class StreamingOrchestrator:
         graph, 
         initial_state: Dict[str, Any], 
         config: Optional[Dict[str, Any]] = None
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Stream the execution of a graph with clean event handling.
         
@@ -40,24 +40,33 @@ class StreamingOrchestrator:
             
             # Stream graph execution
             async for chunk in graph.astream(initial_state, config):
-                logger.debug(f"Received chunk: {list(chunk.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received chunk: %s", list(chunk.keys()))
                 
                 # Process chunk and emit events
-                async for event_chunk in self.processor_registry.process_chunk(chunk, self.emitter):
+                async for event, event_chunk in self.processor_registry.process_chunk(chunk, self.emitter):
                     # Track assistant responses for session storage
-                    self.response_accumulator.process_event_chunk(event_chunk)
+                    self.response_accumulator.process_event(event)
                     yield event_chunk
             
+            # Release buffered assistant text before completing
+            async for event, event_chunk in self.processor_registry.flush(self.emitter):
+                self.response_accumulator.process_event(event)
+                yield event_chunk
+            
             # Emit completion event
-            async for completion_chunk in self.emitter.emit_completion():
-                yield completion_chunk
+            _, completion_chunk = await self.emitter.emit_completion()
+            yield completion_chunk
             
             logger.info(f"Streaming completed for session: {self.session_id}")
             
         except Exception as e:
             logger.error(f"Error in streaming orchestrator: {e}")
-            async for error_chunk in self.emitter.emit_error(f"An error occurred: {str(e)}"):
-                yield error_chunk
+            async for event, event_chunk in self.processor_registry.flush(self.emitter):
+                self.response_accumulator.process_event(event)
+                yield event_chunk
+            _, error_chunk = await self.emitter.emit_error(f"An error occurred: {str(e)}")
+            yield error_chunk
     
     def get_accumulated_response(self) -> str:
         """Get the accumulated assistant response for session storage."""
@@ -69,27 +78,22 @@ class ResponseAccumulator:
     
     def __init__(self):
         self.assistant_content = []
+        # Joined text, cached until the next append
+        self._joined: Optional[str] = ""
     
-    def process_event_chunk(self, event_chunk: str):
-        """Process an event chunk and accumulate assistant content."""
-        try:
-            # Parse the SSE format
-            if event_chunk.startswith("data: "):
-                import json
-                data = json.loads(event_chunk[6:])  # Remove "data: " prefix
-                
-                if data.get("type") == "assistant_response":
-                    content = data.get("content", "")
-                    if content:
-                        self.assistant_content.append(content)
-                        
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.debug(f"Could not parse event chunk for accumulation: {e}")
+    def process_event(self, event: StreamEvent):
+        """Accumulate the content of assistant response events."""
+        if isinstance(event, AssistantResponseEvent) and event.content:
+            self.assistant_content.append(event.content)
+            self._joined = None
     
     def get_full_response(self) -> str:
         """Get the full accumulated assistant response."""
-        return "".join(self.assistant_content)
+        if self._joined is None:
+            self._joined = "".join(self.assistant_content)
+        return self._joined
     
     def reset(self):
         """Reset the accumulator."""
-        self.assistant_content.clear()
\ No newline at end of file
+        self.assistant_content.clear()
+        self._joined = ""
@@ -2,34 +2,89 @@
 Chunk processors for different types of graph outputs.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, AsyncGenerator, List
+from typing import Dict, Any, Optional, AsyncGenerator, List, Tuple
 import logging
+import time
+from functools import lru_cache
+from langchain_core.messages import AIMessage
 from .events import StreamEvent, EventEmitter
 
 logger = logging.getLogger(__name__)
 
+TOOLS_DONE_MESSAGE = "Tools executed successfully, generating response..."
+PROCESSING_MESSAGE = "Processing..."
+
+
+@lru_cache(maxsize=256)
+def _tool_execution_message(tools_text: str) -> str:
+    """Build the status message for a comma-separated list of tool names."""
+    return f"Using {tools_text}..."
+
 
 class ChunkProcessor(ABC):
-    """Abstract base class for processing graph chunks."""
+    """
+    Abstract base class for processing graph chunks.
+    
+    ``node`` is the graph node whose updates the processor handles; the
+    registry dispatches on it. A processor with no node is a fallback.
+    """
+    
+    node: Optional[str] = None
     
     @abstractmethod
-    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[str, None]:
+    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
         """Process a chunk and emit appropriate events."""
         pass
     
-    @abstractmethod
     def can_handle(self, chunk: Dict[str, Any]) -> bool:
         """Check if this processor can handle the given chunk."""
-        pass
+        return self.node is None or self.node in chunk
+    
+    @property
+    def has_pending(self) -> bool:
+        """Whether the processor is holding back output that flush() would emit."""
+        return False
+    
+    async def flush(self, emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
+        """Emit any buffered output. Stateless processors have nothing to flush."""
+        return
+        yield
 
 
 class AssistantChunkProcessor(ChunkProcessor):
-    """Processes chunks from the assistant node."""
+    """
+    Processes chunks from the assistant node.
     
-    def can_handle(self, chunk: Dict[str, Any]) -> bool:
-        return "assistant" in chunk
+    Assistant text is buffered so consecutive small deltas go out as one
+    AssistantResponseEvent. The buffer is flushed once it reaches
+    ``max_chars`` or is ``max_ms`` old, before any tool call, and by the
+    registry before other chunk types or the completion event, so text
+    is never reordered or lost.
+    """
+    
+    node = "assistant"
     
-    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[str, None]:
+    def __init__(self, max_chars: int = 512, max_ms: float = 10):
+        self.max_chars = max_chars
+        self.max_ms = max_ms
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._started_at = 0.0
+    
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._buffer)
+    
+    async def flush(self, emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
+        """Emit the buffered assistant text as a single event."""
+        if not self._buffer:
+            return
+        content = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        yield await emitter.emit_assistant_response(content)
+    
+    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
         """Process assistant responses and emit streaming events."""
         assistant_data = chunk.get("assistant", {})
         messages = assistant_data.get("messages", [])
@@ -38,57 +93,61 @@ class AssistantChunkProcessor(ChunkProcessor):
             return
         
         last_message = messages[-1]
+        if not isinstance(last_message, AIMessage):
+            logger.debug("Skipping non-AI assistant message: %s", type(last_message).__name__)
+            return
         
-        # First, stream any content from the AI message
-        content = getattr(last_message, 'content', '')
+        # First, stream any content from the AI message; .text flattens
+        # providers that return a list of content blocks
+        content = last_message.text
         if content and content.strip():
-            async for event_chunk in emitter.emit_assistant_response(content):
+            if not self._buffer:
+                self._started_at = time.monotonic()
+            self._buffer.append(content)
+            self._buffered_chars += len(content)
+        
+        tool_calls = last_message.tool_calls
+        if (tool_calls or self._buffered_chars >= self.max_chars
+                or (time.monotonic() - self._started_at) * 1000 >= self.max_ms):
+            async for event_chunk in self.flush(emitter):
                 yield event_chunk
         
         # Then, if there are tool calls, emit tool execution event
-        if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-            tool_names = []
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call.get('name') if isinstance(tool_call, dict) else getattr(tool_call, 'name', 'unknown')
-                tool_names.append(tool_name)
-            
-            tools_text = ", ".join(tool_names)
-            tool_content = f"Using {tools_text}..."
-            
-            async for event_chunk in emitter.emit_tool_execution(tool_name=tools_text, content=tool_content):
-                yield event_chunk
+        if tool_calls:
+            tools_text = ", ".join(tool_call["name"] for tool_call in tool_calls)
+            yield await emitter.emit_tool_execution(
+                tool_name=tools_text, content=_tool_execution_message(tools_text)
+            )
 
 
 class ToolsChunkProcessor(ChunkProcessor):
     """Processes chunks from tool execution nodes."""
     
-    def can_handle(self, chunk: Dict[str, Any]) -> bool:
-        return "tools" in chunk
+    node = "tools"
     
-    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[str, None]:
+    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
         """Process tool execution results."""
         tools_data = chunk.get("tools", {})
         messages = tools_data.get("messages", [])
         
         if messages:
             # Tool execution completed, emit a status update
-            content = "Tools executed successfully, generating response..."
-            async for event_chunk in emitter.emit_thinking(content):
-                yield event_chunk
+            yield await emitter.emit_thinking(TOOLS_DONE_MESSAGE)
 
 
 class DefaultChunkProcessor(ChunkProcessor):
     """Default processor for unhandled chunk types."""
     
-    def can_handle(self, chunk: Dict[str, Any]) -> bool:
-        # This is the fallback processor
-        return True
-    
-    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[str, None]:
+    async def process(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
         """Process unknown chunk types with generic thinking message."""
-        logger.debug(f"Processing unknown chunk type: {list(chunk.keys())}")
-        async for event_chunk in emitter.emit_thinking("Processing..."):
-            yield event_chunk
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing unknown chunk type: %s", list(chunk.keys()))
+        yield await emitter.emit_thinking(PROCESSING_MESSAGE)
+
+
+# Stateless processors are shared by every registry
+_TOOLS_PROCESSOR = ToolsChunkProcessor()
+_DEFAULT_PROCESSOR = DefaultChunkProcessor()
 
 
 class ProcessorRegistry:
@@ -96,36 +155,56 @@ class ProcessorRegistry:
     
     def __init__(self):
         self.processors: List[ChunkProcessor] = []
+        self._by_node: Dict[str, ChunkProcessor] = {}
+        self._default: Optional[ChunkProcessor] = None
         self._setup_default_processors()
     
     def _setup_default_processors(self):
         """Set up the default processors."""
-        # Order matters - more specific processors first
+        # Per registry: buffers assistant text for this stream
         self.register(AssistantChunkProcessor())
-        self.register(ToolsChunkProcessor())
-        # Default processor last (catches everything)
-        self.register(DefaultChunkProcessor())
+        self.register(_TOOLS_PROCESSOR)
+        # Fallback for nodes without a dedicated processor
+        self.register(_DEFAULT_PROCESSOR)
     
     def register(self, processor: ChunkProcessor):
-        """Register a new processor."""
+        """Register a new processor, replacing any earlier one for the same node."""
         self.processors.append(processor)
+        if processor.node is None:
+            self._default = processor
+        else:
+            self._by_node[processor.node] = processor
     
     def get_processor(self, chunk: Dict[str, Any]) -> ChunkProcessor:
         """Get the appropriate processor for a chunk."""
-        for processor in self.processors:
-            if processor.can_handle(chunk):
+        by_node = self._by_node
+        for node in chunk:
+            processor = by_node.get(node)
+            if processor is not None:
                 return processor
         
-        # This should never happen since DefaultChunkProcessor catches everything
-        raise ValueError(f"No processor found for chunk: {chunk}")
+        if self._default is None:
+            raise ValueError(f"No processor found for chunk: {chunk}")
+        return self._default
     
-    async def process_chunk(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[str, None]:
+    async def process_chunk(self, chunk: Dict[str, Any], emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
         """Process a chunk using the appropriate processor."""
         try:
             processor = self.get_processor(chunk)
+            # Release text buffered by other processors first to keep event order
+            for other in self.processors:
+                if other is not processor and other.has_pending:
+                    async for event_chunk in other.flush(emitter):
+                        yield event_chunk
             async for event_chunk in processor.process(chunk, emitter):
                 yield event_chunk
         except Exception as e:
             logger.error(f"Error processing chunk {chunk}: {e}")
-            async for event_chunk in emitter.emit_error(f"Error processing response: {str(e)}"):
-                yield event_chunk
\ No newline at end of file
+            yield await emitter.emit_error(f"Error processing response: {str(e)}")
+    
+    async def flush(self, emitter: EventEmitter) -> AsyncGenerator[Tuple[StreamEvent, bytes], None]:
+        """Emit everything still buffered by any processor."""
+        for processor in self.processors:
+            if processor.has_pending:
+                async for event_chunk in processor.flush(emitter):
+                    yield event_chunk
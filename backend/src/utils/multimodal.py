@@ -1,14 +1,230 @@
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Tuple
+from collections import OrderedDict
 from langchain_core.messages import HumanMessage
-import base64
+import hashlib
 import logging
+import os
+import threading
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    # SIMD-accelerated drop-in with identical output
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
 
 logger = logging.getLogger(__name__)
 
+# Read size for encoding; a multiple of 3 so no chunk but the last is padded
+_ENCODE_CHUNK_SIZE = 57 * 1024
+
+# Image formats that are text and can be sent without base64
+_TEXT_MIME_TYPES = frozenset({"image/svg+xml"})
+
+# Encodings shared across paths and sessions, keyed by content hash. The
+# path cache maps (path, mtime_ns, size) to a content hash only, so each
+# encoding is held once however many paths refer to it. The content cache
+# is bounded by the total size of its encodings, and encodings larger than
+# a quarter of that budget are not cached at all.
+_CONTENT_CACHE_MAX_BYTES = 64 << 20
+_PATH_CACHE_SIZE = 256
+_content_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_content_cache_bytes = 0
+_path_cache: "OrderedDict[Tuple[str, int, int], bytes]" = OrderedDict()
+_content_cache_lock = threading.Lock()
+
 def encode_image_to_base64(image_path: str) -> str:
-    """"""
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
+    """
+    Read an image file and return its contents base64-encoded.
+    Results are cached per path and invalidated when the file's
+    modification time or size changes.
+    """
+    stat = os.stat(image_path)
+    key = (image_path, stat.st_mtime_ns, stat.st_size)
+    with _content_cache_lock:
+        digest = _path_cache.get(key)
+        if digest is not None:
+            _path_cache.move_to_end(key)
+    if digest is not None:
+        encoded = _get_cached_content(digest)
+        if encoded is not None:
+            return encoded
+
+    digest, encoded = _encode_file(image_path)
+    with _content_cache_lock:
+        _path_cache[key] = digest
+        _path_cache.move_to_end(key)
+        if len(_path_cache) > _PATH_CACHE_SIZE:
+            _path_cache.popitem(last=False)
+    return encoded
+
+def encode_images_to_base64(image_paths: List[str]) -> List[str]:
+    """
+    Encode several image files concurrently, preserving order. File reads
+    and pybase64 both release the GIL, so disk latency and encoding overlap.
+    """
+    if len(image_paths) < 2:
+        return [encode_image_to_base64(path) for path in image_paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(image_paths))) as executor:
+        return list(executor.map(encode_image_to_base64, image_paths))
+
+def _resolve_image_paths(image_data: List[Dict]) -> List[Dict]:
+    """Fill in base64 'content' for entries that only give a file 'path'."""
+    pending = [
+        i for i, img_data in enumerate(image_data)
+        if 'content' not in img_data and 'url' not in img_data
+    ]
+    if not pending:
+        return image_data
+    encoded = encode_images_to_base64([image_data[i]['path'] for i in pending])
+    resolved = list(image_data)
+    for i, content in zip(pending, encoded):
+        resolved[i] = {**image_data[i], 'content': content}
+    return resolved
+
+def _encode_file(image_path: str) -> Tuple[bytes, str]:
+    """
+    Encode a file, returning its content hash and encoding and reusing
+    the encoding of any identical content seen under another path.
+    Files of any size are read through a raw descriptor in fixed chunks
+    rather than memory-mapped, since a mapped file truncated mid-read
+    raises SIGBUS and kills the process.
+    """
+    fd = os.open(image_path, os.O_RDONLY)
+    try:
+        length = os.fstat(fd).st_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_SEQUENTIAL)
+        digest = _hash_fd(fd, length)
+        encoded = _get_cached_content(digest)
+        if encoded is None:
+            # Second pass is served from the page cache warmed by hashing
+            os.lseek(fd, 0, os.SEEK_SET)
+            encoded = _encode_fd(fd, length)
+    finally:
+        os.close(fd)
+
+    return digest, _store_content(digest, encoded)
+
+def _get_cached_content(digest: bytes) -> Optional[str]:
+    """Look up a previously encoded file by content hash."""
+    with _content_cache_lock:
+        encoded = _content_cache.get(digest)
+        if encoded is not None:
+            _content_cache.move_to_end(digest)
+        return encoded
+
+def _store_content(digest: bytes, encoded: str) -> str:
+    """
+    Remember an encoding by content hash, returning the shared copy.
+    The least recently used encodings are dropped to stay within
+    _CONTENT_CACHE_MAX_BYTES.
+    """
+    global _content_cache_bytes
+    if len(encoded) > _CONTENT_CACHE_MAX_BYTES // 4:
+        return encoded
+    with _content_cache_lock:
+        cached = _content_cache.get(digest)
+        if cached is not None:
+            return cached
+        _content_cache[digest] = encoded
+        _content_cache_bytes += len(encoded)
+        while _content_cache_bytes > _CONTENT_CACHE_MAX_BYTES:
+            _, evicted = _content_cache.popitem(last=False)
+            _content_cache_bytes -= len(evicted)
+    return encoded
+
+def _read_chunks(fd: int, length: int):
+    """
+    Yield a file's contents in chunks, stopping at ``length`` bytes even
+    if the file grew after it was stat'd.
+    """
+    remaining = length
+    while remaining and (chunk := os.read(fd, min(_ENCODE_CHUNK_SIZE, remaining))):
+        remaining -= len(chunk)
+        yield chunk
+
+def _hash_fd(fd: int, length: int) -> bytes:
+    """Hash the first ``length`` bytes of a file for use as a content cache key."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for chunk in _read_chunks(fd, length):
+        hasher.update(chunk)
+    return hasher.digest()
+
+def _encode_fd(fd: int, length: int) -> str:
+    """
+    Encode a file in chunks into an output buffer sized once from the
+    file length, so the raw bytes are never held in memory alongside the
+    full encoded output and the buffer never has to grow. At most
+    ``length`` bytes are read, so a file that grows meanwhile cannot
+    overflow the buffer.
+    """
+    encoded = bytearray(4 * ((length + 2) // 3))
+    view = memoryview(encoded)
+    offset = 0
+    carry = b""
+    for chunk in _read_chunks(fd, length):
+        if carry:
+            chunk = carry + chunk
+        # os.read may return short; hold back a partial 3-byte group so
+        # padding can only appear at the very end
+        whole = len(chunk) - len(chunk) % 3
+        carry = chunk[whole:]
+        block = b64encode(chunk[:whole])
+        view[offset:offset + len(block)] = block
+        offset += len(block)
+    if carry:
+        block = b64encode(carry)
+        view[offset:offset + len(block)] = block
+        offset += len(block)
+    view.release()
+    # Only short if the file shrank while it was being read
+    del encoded[offset:]
+    return encoded.decode('ascii')
+
+@lru_cache(maxsize=64)
+def _data_url_prefix(mime_type: str) -> str:
+    """Build the ``data:`` URL prefix for a mime type."""
+    return f"data:{mime_type};base64,"
+
+def _image_url(img_data: Dict) -> str:
+    """
+    Build the URL for an image. An image already hosted at a 'url' is
+    referenced as-is, so nothing is encoded or uploaded inline. Text
+    formats such as SVG that carry their source in ``raw_text`` are
+    URL-encoded, which is smaller than base64; everything else becomes a
+    data URL from the base64 ``content``.
+    """
+    url = img_data.get('url')
+    if url is not None:
+        return url
+    mime_type = img_data['mime_type']
+    raw_text = img_data.get('raw_text')
+    if raw_text is not None and mime_type in _TEXT_MIME_TYPES:
+        return f"data:{mime_type},{quote(raw_text, safe='')}"
+    return _data_url_prefix(mime_type) + img_data['content']
+
+def _image_url_block(img_data: Dict, detail_level: str) -> Dict:
+    """Build the image_url content block for one image."""
+    return {
+        "type": "image_url",
+        "image_url": {
+            "url": _image_url(img_data),
+            "detail": detail_level
+        }
+    }
+
+@lru_cache(maxsize=64)
+def _caption_labels(text_template: str, total: int) -> Tuple[str, ...]:
+    """Format the per-image captions for a template and image count once."""
+    fields = {"total": total}
+    labels = []
+    for index in range(1, total + 1):
+        fields["index"] = index
+        labels.append(text_template.format_map(fields))
+    return tuple(labels)
 
 def create_image_content(
         img_data: Dict, 
@@ -16,18 +232,16 @@ def create_image_content(
         detail_level: str = "low"
         ) -> List[Dict]:
     """
-    Create image content for a single image with optional text
+    Create image content for a single image with optional text.
+    img_data holds 'mime_type' and base64 'content', plus an optional
+    'raw_text' source for text formats like SVG. A hosted image can give
+    a 'url' instead, for providers that fetch images by URL.
+    transform_to_multimodal also accepts a file 'path' in place of 'content'.
     """
     content = []
     if text:
         content.append({"type": "text", "text": text})
-    content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:{img_data['mime_type']};base64,{img_data['content']}",
-                    "detail": detail_level
-                }
-            })
+    content.append(_image_url_block(img_data, detail_level))
     return content
 
 def create_batch_image_content(
@@ -41,9 +255,13 @@ def create_batch_image_content(
 
     if intro_text:
         content.append({"type": "text", "text": intro_text})
-    for i, img_data in enumerate(image_data, 1):
-        text = text_template.format(index=i, total=len(image_data))
-        content.extend(create_image_content(img_data, text, detail_level))
+    # Blocks are appended directly rather than through create_image_content,
+    # which would build and discard a list per image
+    labels = _caption_labels(text_template, len(image_data))
+    for text, img_data in zip(labels, image_data):
+        if text:
+            content.append({"type": "text", "text": text})
+        content.append(_image_url_block(img_data, detail_level))
 
     return content
 
@@ -56,11 +274,12 @@ def create_individual_image_messages(
     """Create a separate HumanMessage for each image."""
     messages: List[HumanMessage] = []
 
+    labels = None if text_generator else _caption_labels(text_template, len(image_data))
     for i, img_data in enumerate(image_data, 1):
         if text_generator:
             text = text_generator(i, img_data)
         else:
-            text = text_template.format(index=i, total=len(image_data))
+            text = labels[i - 1]
 
         #   ^^^^^^^^  PASS **img_data**, not the whole list!
         content = create_image_content(img_data, text, detail_level)
@@ -90,11 +309,20 @@ def transform_to_multimodal(
     if not image_data:
         return [HumanMessage(content=intro_text)] if intro_text else []
     
+    # Encode any images given by path up front, in parallel
+    image_data = _resolve_image_paths(image_data)
     messages = []
 
     if intro_text:
         messages.append(HumanMessage(content=intro_text))
 
+    # A single image yields the same message in either mode, so skip the
+    # dispatch unless a per-image text generator needs the individual path
+    if len(image_data) == 1 and text_generator is None:
+        text = _caption_labels(text_template, 1)[0]
+        messages.append(HumanMessage(content=create_image_content(image_data[0], text, detail_level)))
+        return messages
+
     if mode == "batch":
         content = create_batch_image_content(image_data, detail_level, text_template)
         messages.append(HumanMessage(content=content))
@@ -0,0 +1,25 @@
+"""
+Coarse wall clock for hot paths.
+
+The wall-clock time is cached together with a monotonic stamp and only
+re-read once that stamp is more than TICK_SECONDS old, so bursts of calls
+share one reading. Nothing runs in the background between calls.
+"""
+import time
+
+TICK_SECONDS = 0.01
+
+_TICK_NS = int(TICK_SECONDS * 1_000_000_000)
+
+_now_ms = time.time_ns() // 1_000_000
+_stamp_ns = time.monotonic_ns()
+
+
+def now_ms() -> int:
+    """Current UTC time in epoch milliseconds, accurate to TICK_SECONDS."""
+    global _now_ms, _stamp_ns
+    stamp_ns = time.monotonic_ns()
+    if stamp_ns - _stamp_ns >= _TICK_NS:
+        _now_ms = time.time_ns() // 1_000_000
+        _stamp_ns = stamp_ns
+    return _now_ms
@@ -4,6 +4,7 @@ This file provides reusable test fixtures and utilities.
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 from contextlib import asynccontextmanager
@@ -11,26 +12,20 @@ from typing import Dict, Any, List
 import sys
 import os
 
-# Simulate the Docker environment where we cd into the src directory
-# Add both the src directory AND change working directory context
+# Simulate the Docker environment, which runs from the src directory:
+# put src on sys.path so modules import as top-level packages
 src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
 sys.path.insert(0, src_path)
 
-# Also add the parent directory so relative imports work
+# Also add the parent directory so src.* imports work
 parent_path = os.path.join(os.path.dirname(__file__), '..')
 sys.path.insert(0, parent_path)
 
-# Change the working directory for imports to match Docker behavior
-original_cwd = os.getcwd()
-os.chdir(src_path)
-
-# Now import - this will work because we're "in" the src directory
 from graphs.chat_graph import ChatGraph
 from models.states import ChatState  
 from services.session_service import SessionService
-
-# Change back to original directory after imports
-os.chdir(original_cwd)
+from utils.multimodal import encode_image_to_base64
+from src.clients.models import AWSBedrockModelFactory, AWSBedrockSettings
 
 
 # ============================================================================
@@ -49,9 +44,9 @@ def event_loop():
 # MOCK FIXTURES - For fast, isolated testing
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_assistant():
-    """Mock MultiModalAssistant for testing"""
+    """Mock MultiModalAssistant for testing (shared per module, reset by mocked_chat_graph)"""
     assistant = Mock()
     
     # Mock invoke method for sync calls
@@ -66,9 +61,9 @@ def mock_assistant():
     return assistant
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_tools():
-    """Mock finance tools for testing"""
+    """Mock finance tools for testing (shared per module)"""
     tools = []
     
     # Stock price tool
@@ -123,7 +118,7 @@ def mock_finance_tools_factory():
     return factory
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_message_strategy():
     """Mock message strategy"""
     strategy = Mock()
@@ -167,7 +162,7 @@ def chat_state_with_messages(base_chat_state):
 # GRAPH FIXTURES - For testing the ChatGraph
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def base_graph_config():
     """Standard configuration for ChatGraph"""
     return {
@@ -193,16 +188,28 @@ def production_chat_graph(base_graph_config):
         yield graph
 
 
-@pytest.fixture 
-def mocked_chat_graph(base_graph_config, mock_assistant, mock_tools, mock_message_strategy):
-    """Fully mocked ChatGraph for fast testing"""
-    graph = ChatGraph(
+@pytest.fixture(scope="module")
+def shared_chat_graph(base_graph_config, mock_assistant, mock_tools, mock_message_strategy):
+    """Fully mocked ChatGraph built once per module"""
+    return ChatGraph(
         **base_graph_config,
         assistant=mock_assistant,
         tools=mock_tools,
         message_strategy=mock_message_strategy
     )
-    return graph
+
+
+@pytest.fixture
+def reset_mocks(mock_assistant, mock_tools, mock_message_strategy):
+    """Clear call history and per-test side effects on the shared mocks"""
+    for mock in (mock_assistant, mock_message_strategy, *mock_tools):
+        mock.reset_mock(side_effect=True)
+
+
+@pytest.fixture 
+def mocked_chat_graph(shared_chat_graph, reset_mocks):
+    """Fully mocked ChatGraph for fast testing, with mocks reset for each test"""
+    return shared_chat_graph
 
 
 # ============================================================================
@@ -224,13 +231,52 @@ async def session_with_history(session_service):
     session_id = await session_service.create_session()
     
     # Add some conversation history
-    await session_service.add_message(session_id, "user", "Hello")
-    await session_service.add_message(session_id, "assistant", "Hi there!")
-    await session_service.add_message(session_id, "user", "What's AAPL trading at?")
+    await session_service.add_messages(session_id, [
+        ("user", "Hello"),
+        ("assistant", "Hi there!"),
+        ("user", "What's AAPL trading at?")
+    ])
     
     return session_service, session_id
 
 
+# ============================================================================
+# MULTIMODAL FIXTURES
+# ============================================================================
+
+@pytest_asyncio.fixture
+async def encoded_images(request, tmp_path):
+    """
+    Sample image files with their base64 encodings, encoded concurrently.
+    Parametrize indirectly with the number of images (default 3).
+    """
+    count = getattr(request, "param", 3)
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"image_{i}.png"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes([i]) * 1024)
+        paths.append(str(path))
+
+    # Encoding releases the GIL, so threads overlap
+    encodings = await asyncio.gather(
+        *(asyncio.to_thread(encode_image_to_base64, path) for path in paths)
+    )
+    return list(zip(paths, encodings))
+
+
+# ============================================================================
+# MODEL CLIENT FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def bedrock_factories():
+    """Bedrock model factories keyed by model ID, built once per test session"""
+    return {
+        model_id: AWSBedrockModelFactory(settings=AWSBedrockSettings(BEDROCK_MODEL_ID=model_id))
+        for model_id in BEDROCK_MAX_TOKENS_PARAMS
+    }
+
+
 # ============================================================================
 # API TESTING FIXTURES  
 # ============================================================================
@@ -249,6 +295,7 @@ def mock_app_dependencies():
         mock_session_svc.session_exists = AsyncMock(return_value=True)
         mock_session_svc.get_session_config = AsyncMock(return_value={})
         mock_session_svc.add_message = AsyncMock()
+        mock_session_svc.add_messages = AsyncMock()
         
         yield mock_graph, mock_session_svc
 
@@ -338,6 +385,17 @@ FINANCIAL_TEST_QUERIES = [
     }
 ]
 
+# Bedrock model IDs and the name each family uses for the max tokens parameter
+BEDROCK_MAX_TOKENS_PARAMS = {
+    "mistral.mistral-large-2407-v1:0": "max_tokens",
+    "meta.llama3-1-405b-instruct-v1:0": "max_gen_len",
+    "openai.gpt-oss-20b-v1:0": "max_completion_tokens",
+    "amazon.nova-pro-v1:0": "maxTokens",
+    "amazon.titan-text-express-v1": "maxTokenCount",
+    "anthropic.claude-3-5-sonnet-20241022-v2:0": "max_tokens",
+    "cohere.command-r-plus-v1:0": "max_tokens",
+}
+
 # Sample portfolio data
 SAMPLE_PORTFOLIO = {
     "user": "John Doe",
@@ -391,6 +449,10 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: marks tests as slow running"
     )
+    # Registered here as well so the marker is valid when pytest-xdist isn't installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keeps tests in the same group on one pytest-xdist worker"
+    )
     
 # backend/conftest.py (add this to enable integration tests)
 def pytest_addoption(parser):
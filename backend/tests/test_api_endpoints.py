@@ -88,6 +88,32 @@ def test_app_can_be_imported():
         pytest.skip(f"App import failed with: {e}")
 
 
+def test_schema_validators_built_at_import():
+    """Test that API models build their validators eagerly, not on first request"""
+    from pydantic import BaseModel
+    from models import schemas
+    
+    models = [
+        obj for obj in vars(schemas).values()
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and obj is not BaseModel
+    ]
+    assert models
+    for model in models:
+        assert model.__pydantic_complete__, f"{model.__name__} defers schema building"
+
+
+def test_openapi_includes_schema_examples():
+    """Test that model examples are merged into the generated OpenAPI schema"""
+    try:
+        import app
+    except Exception as e:
+        pytest.skip(f"Could not import app: {e}")
+    
+    schemas = app.app.openapi()["components"]["schemas"]
+    assert "example" in schemas["ChatRequest"]
+    assert "example" in schemas["NewSessionResponse"]
+
+
 @pytest.mark.asyncio
 async def test_async_with_pytest():
     """Test that pytest-asyncio works"""
@@ -1,15 +1,28 @@
 # backend/tests/clients/test_models.py
+import re
 import pytest
 from unittest.mock import patch, MagicMock
 from src.clients.models import AWSBedrockModelFactory, AWSBedrockSettings
+from .conftest import BEDROCK_MAX_TOKENS_PARAMS
+
+_RE_BEDROCK_ID = re.compile(r"BEDROCK_MODEL_ID must be set")
+
+
+@pytest.fixture(scope="module")
+def default_settings():
+    """Default AWSBedrockSettings shared by read-only tests, built without AWS env overrides"""
+    with pytest.MonkeyPatch.context() as mp:
+        for name in AWSBedrockSettings.model_fields:
+            mp.delenv(name, raising=False)
+        return AWSBedrockSettings(_env_file=None)
 
 
 class TestAWSBedrockSettings:
     """Test suite for AWSBedrockSettings"""
 
-    def test_default_settings(self):
+    def test_default_settings(self, default_settings):
         """Test default settings values"""
-        settings = AWSBedrockSettings()
+        settings = default_settings
         
         assert settings.AWS_REGION == "us-east-1"
         assert settings.MAX_TOKENS == 4000
@@ -18,6 +31,8 @@ class TestAWSBedrockSettings:
         assert settings.TOP_K is None
         assert settings.BEDROCK_MODEL_ID is None
 
+    # Mutates os.environ, so under pytest-xdist keep it on a single worker
+    @pytest.mark.xdist_group("env_mutation")
     def test_settings_from_env(self, monkeypatch):
         """Test that settings load from environment variables"""
         monkeypatch.setenv("AWS_REGION", "us-west-2")
@@ -40,7 +55,7 @@ class TestAWSBedrockSettings:
 class TestAWSBedrockModelFactory:
     """Test suite for AWSBedrockModelFactory"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def factory(self):
         """Create a factory instance with test settings"""
         settings = AWSBedrockSettings(
@@ -230,11 +245,11 @@ class TestAWSBedrockModelFactory:
         assert call_kwargs["aws_access_key_id"] == "test-key-id"
         assert call_kwargs["aws_secret_access_key"] == "test-secret-key"
 
-    def test_create_model_no_model_id_raises(self):
+    def test_create_model_no_model_id_raises(self, default_settings):
         """Test that missing model ID raises ValueError"""
-        factory = AWSBedrockModelFactory(settings=AWSBedrockSettings())
+        factory = AWSBedrockModelFactory(settings=default_settings)
         
-        with pytest.raises(ValueError, match="BEDROCK_MODEL_ID must be set"):
+        with pytest.raises(ValueError, match=_RE_BEDROCK_ID):
             factory.create_model()
 
     @patch('src.clients.models.ChatBedrock')
@@ -248,21 +263,12 @@ class TestAWSBedrockModelFactory:
         call_kwargs = mock_chatbedrock.call_args.kwargs
         assert call_kwargs["model_id"] == "openai.gpt-oss-20b-v1:0"  # From settings
 
-    @pytest.mark.parametrize("model_id,expected_max_tokens_param", [
-        ("mistral.mistral-large-2407-v1:0", "max_tokens"),
-        ("meta.llama3-1-405b-instruct-v1:0", "max_gen_len"),
-        ("openai.gpt-oss-20b-v1:0", "max_completion_tokens"),
-        ("amazon.nova-pro-v1:0", "maxTokens"),
-        ("amazon.titan-text-express-v1", "maxTokenCount"),
-        ("anthropic.claude-3-5-sonnet-20241022-v2:0", "max_tokens"),
-        ("cohere.command-r-plus-v1:0", "max_tokens"),
-    ])
+    @pytest.mark.parametrize("model_id,expected_max_tokens_param", BEDROCK_MAX_TOKENS_PARAMS.items())
     @patch('src.clients.models.ChatBedrock')
-    def test_max_tokens_translation_for_all_models(self, mock_chatbedrock, model_id, expected_max_tokens_param):
+    def test_max_tokens_translation_for_all_models(self, mock_chatbedrock, bedrock_factories,
+                                                   model_id, expected_max_tokens_param):
         """Test that max_tokens is correctly translated for all model families"""
-        factory = AWSBedrockModelFactory(settings=AWSBedrockSettings(
-            BEDROCK_MODEL_ID=model_id
-        ))
+        factory = bedrock_factories[model_id]
         
         mock_model = MagicMock()
         mock_chatbedrock.return_value = mock_model
@@ -3,6 +3,41 @@ import pytest
 from src.clients.capability_map import BedrockModelParameters
 
 
+def _config(max_tokens="max_tokens", top_p="top_p", top_k="top_k",
+            logprobs=None, reasoning_effort=None):
+    """Build an expected parameter config; most families share these names"""
+    return {
+        "max_tokens": max_tokens,
+        "temperature": "temperature",
+        "top_p": top_p,
+        "top_k": top_k,
+        "streaming": "streaming",
+        "verbose": "verbose",
+        "logprobs": logprobs,
+        "reasoning_effort": reasoning_effort,
+    }
+
+
+_EXPECTED_CONFIGS = [
+    pytest.param("mistral.mistral-large-2407-v1:0", _config(), id="mistral"),
+    # Llama doesn't support top_k
+    pytest.param("meta.llama3-1-405b-instruct-v1:0", _config(max_tokens="max_gen_len", top_k=None), id="llama"),
+    # OpenAI supports logprobs and reasoning_effort (o1 models), not top_k
+    pytest.param("openai.gpt-oss-20b-v1:0", _config(max_tokens="max_completion_tokens", top_k=None,
+                                                    logprobs="logprobs", reasoning_effort="reasoning_effort"),
+                 id="openai"),
+    pytest.param("anthropic.claude-3-5-sonnet-20241022-v2:0", _config(), id="anthropic"),
+    # Amazon models use camelCase
+    pytest.param("amazon.nova-pro-v1:0", _config(max_tokens="maxTokens", top_p="topP", top_k=None), id="amazon_nova"),
+    pytest.param("amazon.titan-text-express-v1", _config(max_tokens="maxTokenCount", top_p="topP", top_k=None),
+                 id="amazon_titan"),
+    # Cohere uses 'p' and 'k'
+    pytest.param("cohere.command-r-plus-v1:0", _config(top_p="p", top_k="k"), id="cohere"),
+    # Unknown models get safe generic defaults
+    pytest.param("unknown.provider-model-v1:0", _config(), id="unknown_model"),
+]
+
+
 class TestBedrockModelParameters:
     """Test suite for BedrockModelParameters parameter translation"""
 
@@ -29,110 +64,10 @@ class TestBedrockModelParameters:
         assert prefix == expected_prefix
 
     # Test parameter config retrieval
-    def test_get_parameter_config_mistral(self):
-        """Test parameter config for Mistral models"""
-        config = BedrockModelParameters.get_parameter_config("mistral.mistral-large-2407-v1:0")
-        
-        assert config["max_tokens"] == "max_tokens"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "top_p"
-        assert config["top_k"] == "top_k"
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_llama(self):
-        """Test parameter config for Llama models"""
-        config = BedrockModelParameters.get_parameter_config("meta.llama3-1-405b-instruct-v1:0")
-        
-        assert config["max_tokens"] == "max_gen_len"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "top_p"
-        assert config["top_k"] is None  # Llama doesn't support top_k
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_openai(self):
-        """Test parameter config for OpenAI models"""
-        config = BedrockModelParameters.get_parameter_config("openai.gpt-oss-20b-v1:0")
-        
-        assert config["max_tokens"] == "max_completion_tokens"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "top_p"
-        assert config["top_k"] is None  # OpenAI doesn't support top_k
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] == "logprobs"  # OpenAI supports logprobs
-        assert config["reasoning_effort"] == "reasoning_effort"  # For o1 models
-
-    def test_get_parameter_config_anthropic(self):
-        """Test parameter config for Anthropic Claude models"""
-        config = BedrockModelParameters.get_parameter_config("anthropic.claude-3-5-sonnet-20241022-v2:0")
-        
-        assert config["max_tokens"] == "max_tokens"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "top_p"
-        assert config["top_k"] == "top_k"
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_amazon_nova(self):
-        """Test parameter config for Amazon Nova models"""
-        config = BedrockModelParameters.get_parameter_config("amazon.nova-pro-v1:0")
-        
-        assert config["max_tokens"] == "maxTokens"  # camelCase
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "topP"  # camelCase
-        assert config["top_k"] is None
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_amazon_titan(self):
-        """Test parameter config for Amazon Titan models"""
-        config = BedrockModelParameters.get_parameter_config("amazon.titan-text-express-v1")
-        
-        assert config["max_tokens"] == "maxTokenCount"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "topP"
-        assert config["top_k"] is None
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_cohere(self):
-        """Test parameter config for Cohere models"""
-        config = BedrockModelParameters.get_parameter_config("cohere.command-r-plus-v1:0")
-        
-        assert config["max_tokens"] == "max_tokens"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "p"  # Cohere uses 'p'
-        assert config["top_k"] == "k"  # Cohere uses 'k'
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
-
-    def test_get_parameter_config_unknown_model(self):
-        """Test that unknown models get safe defaults"""
-        config = BedrockModelParameters.get_parameter_config("unknown.provider-model-v1:0")
-        
-        # Should return generic defaults
-        assert config["max_tokens"] == "max_tokens"
-        assert config["temperature"] == "temperature"
-        assert config["top_p"] == "top_p"
-        assert config["top_k"] == "top_k"
-        assert config["streaming"] == "streaming"
-        assert config["verbose"] == "verbose"
-        assert config["logprobs"] is None
-        assert config["reasoning_effort"] is None
+    @pytest.mark.parametrize("model_id,expected", _EXPECTED_CONFIGS)
+    def test_get_parameter_config(self, model_id, expected):
+        """Test each model family maps every parameter to its provider-specific name"""
+        assert BedrockModelParameters.get_parameter_config(model_id) == expected
 
     def test_all_configs_have_required_keys(self):
         """Test that all model configs have the required parameter keys"""
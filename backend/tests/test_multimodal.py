@@ -0,0 +1,184 @@
+"""
+Tests for multimodal helpers - image encoding and message construction.
+"""
+
+import base64
+import os
+import pytest
+
+from utils import multimodal
+from utils.multimodal import (
+    encode_image_to_base64,
+    create_image_content,
+    transform_to_multimodal,
+    _ENCODE_CHUNK_SIZE,
+    _encode_fd,
+)
+
+
+# ============================================================================
+# IMAGE ENCODING TESTS
+# ============================================================================
+
+class TestEncodeImageToBase64:
+    """Test chunked base64 encoding matches a one-shot encode"""
+
+    @pytest.mark.parametrize("size", [
+        0,
+        1,
+        _ENCODE_CHUNK_SIZE - 1,
+        _ENCODE_CHUNK_SIZE,
+        _ENCODE_CHUNK_SIZE + 1,
+        3 * _ENCODE_CHUNK_SIZE + 2,
+        (1 << 20) + 1,
+    ])
+    def test_matches_stdlib_encoding(self, tmp_path, size):
+        """Test output is identical across chunk boundaries and padding cases"""
+        data = bytes(i % 251 for i in range(size))
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(data)
+
+        assert encode_image_to_base64(str(image_path)) == base64.b64encode(data).decode("ascii")
+
+    def test_cache_invalidated_when_file_changes(self, tmp_path):
+        """Test a rewritten file is re-encoded rather than served from cache"""
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(b"first")
+        assert encode_image_to_base64(str(image_path)) == base64.b64encode(b"first").decode("ascii")
+
+        image_path.write_bytes(b"second!")
+        stat = image_path.stat()
+        os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert encode_image_to_base64(str(image_path)) == base64.b64encode(b"second!").decode("ascii")
+
+    def test_file_grown_after_stat_is_encoded_up_to_stat_size(self, tmp_path):
+        """Test a file longer than its stat'd length encodes only that length"""
+        data = bytes(i % 251 for i in range(3 * _ENCODE_CHUNK_SIZE))
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(data)
+
+        length = _ENCODE_CHUNK_SIZE + 1
+        fd = os.open(image_path, os.O_RDONLY)
+        try:
+            assert _encode_fd(fd, length) == base64.b64encode(data[:length]).decode("ascii")
+        finally:
+            os.close(fd)
+
+    def test_identical_content_shares_one_encoding(self, tmp_path):
+        """Test two paths with the same bytes return the same cached string"""
+        data = b"same picture" * 100
+        first, second = tmp_path / "a.png", tmp_path / "b.png"
+        first.write_bytes(data)
+        second.write_bytes(data)
+
+        assert encode_image_to_base64(str(first)) is encode_image_to_base64(str(second))
+
+    def test_content_cache_is_bounded_by_encoded_size(self, tmp_path, monkeypatch):
+        """Test cached encodings stay within the byte budget and oversized ones are not cached"""
+        monkeypatch.setattr(multimodal, "_CONTENT_CACHE_MAX_BYTES", 4000)
+        for i in range(10):
+            image_path = tmp_path / f"small{i}.png"
+            image_path.write_bytes(bytes([i]) * 600)
+            encode_image_to_base64(str(image_path))
+
+            assert sum(map(len, multimodal._content_cache.values())) <= 4000
+
+        large = tmp_path / "large.png"
+        large.write_bytes(b"x" * 3000)
+        encoded = encode_image_to_base64(str(large))
+        assert encoded not in multimodal._content_cache.values()
+
+
+# ============================================================================
+# IMAGE CONTENT TESTS
+# ============================================================================
+
+class TestCreateImageContent:
+    """Test data URLs built for image content blocks"""
+
+    def test_base64_data_url(self):
+        """Test binary images are sent as base64 data URLs after the text"""
+        content = create_image_content({"mime_type": "image/png", "content": "iVBORw=="}, "Chart:")
+
+        assert content[0] == {"type": "text", "text": "Chart:"}
+        assert content[1]["image_url"]["url"] == "data:image/png;base64,iVBORw=="
+
+    def test_svg_with_raw_text_is_url_encoded(self):
+        """Test SVG source skips base64 and falls back when only content is given"""
+        svg = '<svg xmlns="http://www.w3.org/2000/svg"/>'
+        with_text = create_image_content({"mime_type": "image/svg+xml", "content": "PHN2Zy8+", "raw_text": svg})
+        without_text = create_image_content({"mime_type": "image/svg+xml", "content": "PHN2Zy8+"})
+
+        assert with_text[0]["image_url"]["url"] == (
+            "data:image/svg+xml,%3Csvg%20xmlns%3D%22http%3A%2F%2Fwww.w3.org%2F2000%2Fsvg%22%2F%3E"
+        )
+        assert without_text[0]["image_url"]["url"] == "data:image/svg+xml;base64,PHN2Zy8+"
+
+    def test_hosted_image_url_is_referenced_directly(self):
+        """Test an image given by URL is passed through without a data URL"""
+        content = create_image_content({"mime_type": "image/png", "url": "https://example.com/chart.png"})
+
+        assert content[0]["image_url"]["url"] == "https://example.com/chart.png"
+
+
+# ============================================================================
+# MESSAGE TRANSFORMATION TESTS
+# ============================================================================
+
+class TestTransformToMultimodal:
+    """Test building HumanMessages from image data"""
+
+    def test_images_given_by_path_are_encoded_in_order(self, tmp_path):
+        """Test path-only entries are encoded and keep their position"""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"page_{i}.png"
+            path.write_bytes(f"page {i}".encode())
+            paths.append(path)
+        image_data = [
+            {"mime_type": "image/png", "path": str(paths[0])},
+            {"mime_type": "image/png", "content": "ZW5jb2RlZA=="},
+            {"mime_type": "image/png", "path": str(paths[2])},
+        ]
+
+        messages = transform_to_multimodal("Review these", image_data, mode="batch")
+
+        urls = [block["image_url"]["url"] for block in messages[1].content if block["type"] == "image_url"]
+        assert urls == [
+            "data:image/png;base64," + base64.b64encode(b"page 0").decode("ascii"),
+            "data:image/png;base64,ZW5jb2RlZA==",
+            "data:image/png;base64," + base64.b64encode(b"page 2").decode("ascii"),
+        ]
+        assert "content" not in image_data[0]
+
+    @pytest.mark.parametrize("encoded_images", [4], indirect=True)
+    def test_batch_mode_puts_every_image_in_one_message(self, encoded_images):
+        """Test batch mode captions and embeds each image in a single message"""
+        image_data = [{"mime_type": "image/png", "content": encoded} for _, encoded in encoded_images]
+
+        messages = transform_to_multimodal("", image_data, mode="batch")
+
+        assert len(messages) == 1
+        blocks = messages[0].content
+        assert [block["text"] for block in blocks if block["type"] == "text"] == [
+            f"Image {i} of 4: " for i in range(1, 5)
+        ]
+        assert [block["image_url"]["url"] for block in blocks if block["type"] == "image_url"] == [
+            f"data:image/png;base64,{encoded}" for _, encoded in encoded_images
+        ]
+
+    def test_single_image_matches_across_modes(self):
+        """Test one image produces the same captioned message in both modes"""
+        image_data = [{"mime_type": "image/png", "content": "iVBORw=="}]
+
+        batch = transform_to_multimodal("Intro", image_data, mode="batch")
+        individual = transform_to_multimodal("Intro", image_data, mode="individual")
+
+        assert batch == individual
+        assert [message.content for message in batch] == [
+            "Intro",
+            [
+                {"type": "text", "text": "Image 1 of 1: "},
+                {"type": "image_url", "image_url": {"url": "data:image/png;base64,iVBORw==", "detail": "low"}},
+            ],
+        ]
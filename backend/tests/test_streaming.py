@@ -0,0 +1,152 @@
+"""
+Tests for the streaming module - SSE event formatting and graph stream orchestration.
+Uses a fake graph so no model provider is required.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+from langchain_core.messages import AIMessage
+
+from streaming.orchestrator import StreamingOrchestrator
+from streaming.events import (
+    StreamEvent,
+    AssistantResponseEvent,
+    ToolExecutionEvent,
+    ToolResultEvent,
+    ThinkingEvent,
+    ErrorEvent,
+)
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+class FakeGraph:
+    """Minimal graph exposing astream over a fixed list of updates"""
+
+    def __init__(self, updates):
+        self.updates = updates
+
+    async def astream(self, initial_state, config=None):
+        for update in self.updates:
+            yield update
+
+
+def assistant_update(content: str, tool_calls=None):
+    """Build an assistant node update like LangGraph's astream produces"""
+    tool_calls = [
+        {"name": name, "args": {}, "id": f"call_{i}"} for i, name in enumerate(tool_calls or [])
+    ]
+    message = AIMessage(content=content, tool_calls=tool_calls)
+    return {"assistant": {"messages": [message]}}
+
+
+def parse_frames(chunks):
+    """Split yielded SSE chunks into decoded event dicts"""
+    events = []
+    for chunk in chunks:
+        for line in chunk.split(b"\n"):
+            if line.startswith(b"data: "):
+                events.append(json.loads(line[6:]))
+    return events
+
+
+async def collect(orchestrator, graph):
+    """Run the orchestrator and collect everything it yields"""
+    return [chunk async for chunk in orchestrator.stream_graph_execution(graph, {})]
+
+
+# ============================================================================
+# EVENT SERIALIZATION TESTS
+# ============================================================================
+
+class TestEventSerialization:
+    """Test the SSE wire format of each event type"""
+
+    @pytest.mark.parametrize("event", [
+        StreamEvent(content="done", type="completion", session_id="s1", sequence_id=7),
+        AssistantResponseEvent(content='Quote "AAPL" \u2192 $150\n', session_id="s1"),
+        ToolExecutionEvent(content="Using tools", tool_name="get_stock_price",
+                           tool_input={"symbol": "AAPL"}),
+        ToolResultEvent(content="", tool_name="get_stock_price", result={"price": 150.0}),
+        ThinkingEvent(content="Processing..."),
+        ErrorEvent(content="Boom", error_code="E1", recoverable=False),
+    ])
+    def test_sse_format_round_trips(self, event):
+        """Test each event encodes as a single SSE data frame carrying to_dict()"""
+        frame = event.to_sse_format()
+        assert frame.startswith(b"data: ")
+        assert frame.endswith(b"\n\n")
+        assert json.loads(frame[6:]) == event.to_dict()
+
+
+# ============================================================================
+# ORCHESTRATOR TESTS
+# ============================================================================
+
+class TestStreamingOrchestrator:
+    """Test end-to-end event streaming from graph updates"""
+
+    @pytest.mark.asyncio
+    async def test_streams_assistant_response_and_completion(self):
+        """Test assistant content is streamed and followed by a completion event"""
+        orchestrator = StreamingOrchestrator(session_id="test_session")
+        chunks = await collect(orchestrator, FakeGraph([assistant_update("Hello!")]))
+        # Frames are yielded as bytes so the ASGI server writes them without re-encoding
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+
+        events = parse_frames(chunks)
+        assert [event["type"] for event in events] == ["assistant_response", "completion"]
+        assert events[0]["content"] == "Hello!"
+        assert events[0]["session_id"] == "test_session"
+        assert all(event["timestamp"] for event in events)
+        assert orchestrator.get_accumulated_response() == "Hello!"
+
+    @pytest.mark.asyncio
+    async def test_sequence_ids_are_ordered(self):
+        """Test events carry increasing sequence IDs"""
+        orchestrator = StreamingOrchestrator(session_id="test_session")
+        updates = [
+            assistant_update("Let me check.", tool_calls=["get_stock_price"]),
+            {"tools": {"messages": [Mock()]}},
+            assistant_update("AAPL is trading at $150."),
+        ]
+        events = parse_frames(await collect(orchestrator, FakeGraph(updates)))
+
+        sequence_ids = [event["sequence_id"] for event in events]
+        assert sequence_ids == sorted(sequence_ids)
+        assert len(set(sequence_ids)) == len(sequence_ids)
+        assert orchestrator.get_accumulated_response() == "Let me check.AAPL is trading at $150."
+
+
+    @pytest.mark.asyncio
+    async def test_consecutive_assistant_deltas_are_merged(self):
+        """Test small assistant deltas go out as one event ahead of other events"""
+        orchestrator = StreamingOrchestrator(session_id="test_session")
+        updates = [
+            assistant_update("AAPL "),
+            assistant_update("is "),
+            assistant_update("up."),
+            {"tools": {"messages": [Mock()]}},
+        ]
+        events = parse_frames(await collect(orchestrator, FakeGraph(updates)))
+
+        assert [event["type"] for event in events] == ["assistant_response", "thinking", "completion"]
+        assert events[0]["content"] == "AAPL is up."
+        assert orchestrator.get_accumulated_response() == "AAPL is up."
+
+
+    @pytest.mark.asyncio
+    async def test_content_block_lists_are_streamed_as_text(self):
+        """Test providers returning content blocks stream only their text"""
+        orchestrator = StreamingOrchestrator(session_id="test_session")
+        message = AIMessage(content=[
+            {"type": "text", "text": "Checking AAPL."},
+            {"type": "tool_use", "id": "call_0", "name": "get_stock_price", "input": {}},
+        ])
+        events = parse_frames(await collect(orchestrator, FakeGraph([{"assistant": {"messages": [message]}}])))
+
+        assert events[0]["type"] == "assistant_response"
+        assert events[0]["content"] == "Checking AAPL."
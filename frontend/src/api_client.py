@@ -1,17 +1,68 @@
 from abc import ABC, abstractmethod
-from typing import Optional, AsyncGenerator, Callable
+from typing import Optional, AsyncGenerator, Callable, ClassVar, Mapping
+from types import MappingProxyType
 import os
 import json
 import asyncio
+import atexit
+import concurrent.futures
+import itertools
+import random
+import secrets
 import aiohttp
 import logging
+import threading
 import uuid
 from dotenv import load_dotenv
 
+try:
+    # Parses bytes directly and is much faster on small objects
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Local session IDs are a per-process random prefix plus a counter, so
+# minting one needs no entropy syscall
+_SESSION_ID_PREFIX = secrets.token_hex(4)
+_session_counter = itertools.count()
+
+def _new_session_id(unguessable: bool = False) -> str:
+    """Create a local session ID; unguessable IDs use uuid4."""
+    if unguessable:
+        return str(uuid.uuid4())
+    return f"{_SESSION_ID_PREFIX}-{next(_session_counter):x}"
+
+def _handle_assistant_response(json_data: dict) -> Optional[str]:
+    """Return the content from assistant responses."""
+    return json_data.get('content', '')
+
+def _handle_done(json_data: dict) -> Optional[str]:
+    """
+    Signal that streaming is complete by returning None.
+    The generator will naturally stop yielding.
+    """
+    return None
+
+def _handle_error(json_data: dict) -> Optional[str]:
+    """Handle error messages."""
+    error_msg = json_data.get('content', 'Unknown error occurred')
+    logger.error(f"Streaming error: {error_msg}")
+    raise Exception(f"Stream error: {error_msg}")
+
+# Stream message type -> handler, so each frame is dispatched with one lookup
+_STREAM_HANDLERS = {
+    'assistant_response': _handle_assistant_response,
+    'done': _handle_done,
+    'error': _handle_error,
+}
+
 class APIClientInterface(ABC):
     @abstractmethod
     def get_response(self, user_input: str, session_id: Optional[str] = None) -> str:
@@ -22,18 +73,95 @@ class APIClientInterface(ABC):
         pass
 
 class FinancialAPIClient(APIClientInterface):
-    def __init__(self, base_url: Optional[str] = None, max_retries: int = 3, retry_delay: float = 1.0):
+    # Read-only, so one instance can be handed out to every request
+    _HEADERS: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "Content-Type": "application/json"
+    })
+
+    def __init__(self, base_url: Optional[str] = None, max_retries: int = 3, retry_delay: float = 1.0,
+                 unguessable_session_ids: bool = False):
         load_dotenv()
         self.base_url = base_url or os.getenv("API_BASE_URL", "http://localhost:8000")
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.current_session_id = None
+        self.unguessable_session_ids = unguessable_session_ids
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Background loop for the synchronous API, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
 
-    def _get_headers(self) -> dict:
+    def _get_headers(self) -> Mapping[str, str]:
         """Get headers for API requests."""
-        return {
-            "Content-Type": "application/json"
-        }
+        return self._HEADERS
+
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """
+        Get the HTTP session shared by this client's requests, so keep-alive
+        connections are reused instead of reconnecting on every call.
+        A session is bound to the event loop it was created on, so it is
+        closed and replaced when called from a different loop; callers that
+        own a loop should aclose() the client before closing it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None:
+                await self._close_session(self._session, self._session_loop)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=60),
+                headers=self._get_headers()
+            )
+            self._session_loop = loop
+        return self._session
+
+    @staticmethod
+    async def _close_session(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop) -> None:
+        """Close an HTTP session on the event loop that owns it."""
+        if session.closed:
+            return
+        if loop is not asyncio.get_running_loop() and loop.is_running():
+            # Owned by a loop running in another thread, e.g. the background loop
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            # Owned by this loop, or by one that has already finished and
+            # can no longer run the close itself
+            await session.close()
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and stop the background loop."""
+        if self._session is not None:
+            await self._close_session(self._session, self._session_loop)
+        self._session = None
+        self._session_loop = None
+        self._stop_loop()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the background event loop used by the synchronous API, so its
+        HTTP session and connections live across calls.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="api-client-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _stop_loop(self) -> None:
+        """Stop and close the background event loop, if one was started."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join()
+            loop.close()
 
     def _get_or_create_session_id(self, session_id: Optional[str] = None) -> str:
         """Get existing session ID or create a new one."""
@@ -44,110 +172,119 @@ class FinancialAPIClient(APIClientInterface):
             return self.current_session_id
         else:
             # Create new session ID for this client instance
-            self.current_session_id = str(uuid.uuid4())
+            self.current_session_id = _new_session_id(self.unguessable_session_ids)
             logger.info(f"Created new session: {self.current_session_id}")
             return self.current_session_id
 
+    def run_coroutine(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the client's background loop, where the
+        shared HTTP session lives, and return a future for its result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
     def get_response(self, user_input: str, session_id: Optional[str] = None) -> str:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._get_response_async(user_input, session_id))
-        finally:
-            loop.close()
+        return self.run_coroutine(self._get_response_async(user_input, session_id)).result()
 
     async def get_streaming_response(self, user_input: str, session_id: Optional[str] = None, callback: Optional[Callable[[str], None]] = None) -> AsyncGenerator[str, None]:
         async for chunk in self._get_streaming_response_async(user_input, session_id, callback):
             yield chunk
 
     async def _get_response_async(self, user_input: str, session_id: Optional[str] = None) -> str:
-        # For non-streaming, we'll collect all streaming chunks
-        full_response = ""
+        # For non-streaming, we'll collect all streaming chunks and join once
+        parts = []
         async for chunk in self._get_streaming_response_async(user_input, session_id):
-            full_response += chunk
-        return full_response
+            parts.append(chunk)
+        return "".join(parts)
 
     async def _get_streaming_response_async(self, user_input: str, session_id: Optional[str] = None, callback: Optional[Callable[[str], None]] = None) -> AsyncGenerator[str, None]:
         url = f"{self.base_url}/chat/stream"
-        payload = {
+        # Serialized once, so every attempt sends the same body without re-encoding it
+        payload = json_dumps({
             "user_prompt": user_input,
             "session_id": self._get_or_create_session_id(session_id)
-        }
+        })
 
+        # Retries re-issue the request on the same session and its pooled connections
+        session = await self._get_http()
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(url, json=payload, headers=self._get_headers()) as response:
-                        if response.status == 200:
-                            async for chunk in self._handle_response_stream(response, callback):
-                                yield chunk
-                            return
-                        else:
-                            await self._log_and_retry(response, attempt)
+                async with session.post(url, data=payload) as response:
+                    if response.status == 200:
+                        async for chunk in self._handle_response_stream(response, callback):
+                            yield chunk
+                        return
+                    else:
+                        await self._log_and_retry(response, attempt)
             except Exception as e:
                 if attempt < self.max_retries - 1:
                     logger.error(f"Streaming request error (attempt {attempt+1}): {str(e)}")
-                    await asyncio.sleep(self.retry_delay)
+                    await asyncio.sleep(self._backoff(attempt))
                 else:
                     raise Exception(f"Failed to get streaming response after {self.max_retries} attempts: {str(e)}")
 
     async def _handle_response_stream(self, response: aiohttp.ClientResponse, callback: Optional[Callable[[str], None]]) -> AsyncGenerator[str, None]:
-        async for line in response.content:
-            line = line.decode('utf-8').strip()
-            if not line.startswith("data: "):
-                continue
-            data = line[6:]  # Remove "data: " prefix
-            
+        async for data in self._iter_data_frames(response):
             content = self._parse_stream_line(data)
             if content is not None:
                 if callback:
                     callback(content)
                 yield content
 
-    def _parse_stream_line(self, data: str) -> Optional[str]:
+    async def _iter_data_frames(self, response: aiohttp.ClientResponse) -> AsyncGenerator[bytes, None]:
+        """
+        Yield the payload of each SSE data line as bytes. Lines are split out
+        of one reusable buffer and matched on the bytes prefix, so nothing
+        is decoded until the payload is parsed.
+        """
+        buffer = bytearray()
+        async for raw in response.content.iter_any():
+            buffer += raw
+            start = 0
+            while (end := buffer.find(b"\n", start)) != -1:
+                if buffer.startswith(b"data: ", start, end):
+                    yield bytes(buffer[start + 6:end])  # Remove "data: " prefix
+                start = end + 1
+            del buffer[:start]
+        # A final line may arrive without its newline
+        if buffer.startswith(b"data: "):
+            yield bytes(buffer[6:])
+
+    def _parse_stream_line(self, data: bytes) -> Optional[str]:
         """Parse a single stream line and return content if it's an assistant response."""
         try:
-            json_data = json.loads(data)
-            
-            # Check the type field to determine how to handle this chunk
-            message_type = json_data.get('type', '')
-            
-            if message_type == 'assistant_response':
-                # Return the content from assistant responses
-                return json_data.get('content', '')
-            elif message_type == 'done':
-                # Signal that streaming is complete by returning None
-                # The generator will naturally stop yielding
-                return None
-            elif message_type == 'error':
-                # Handle error messages
-                error_msg = json_data.get('content', 'Unknown error occurred')
-                logger.error(f"Streaming error: {error_msg}")
-                raise Exception(f"Stream error: {error_msg}")
-            else:
-                # Unknown message type, log it but don't yield anything
-                logger.debug(f"Unknown message type '{message_type}': {data}")
-                return None
-                
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to parse JSON: {data}")
+            json_data = json_loads(data)
+        except json.JSONDecodeError:  # orjson's error subclasses this
+            logger.warning("Failed to parse JSON: %r", data)
+            return None
+
+        # Dispatch on the type field to determine how to handle this chunk
+        handler = _STREAM_HANDLERS.get(json_data.get('type', ''))
+        if handler is None:
+            # Unknown message type, log it but don't yield anything
+            logger.debug("Unknown message type '%s': %r", json_data.get('type', ''), data)
             return None
+        return handler(json_data)
 
     async def _log_and_retry(self, response: aiohttp.ClientResponse, attempt: int):
         error_text = await response.text()
         logger.error(f"API error (attempt {attempt+1}/{self.max_retries}): {response.status} - {error_text}")
         if attempt < self.max_retries - 1:
-            await asyncio.sleep(self.retry_delay)
+            await asyncio.sleep(self._backoff(attempt))
         else:
             raise Exception(f"API error: {response.status} - {error_text}")
 
+    def _backoff(self, attempt: int) -> float:
+        """Delay before the next retry: exponential, with jitter so clients don't retry in lockstep."""
+        return self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.0)
+
     def get_session_id(self) -> Optional[str]:
         """Get the current session ID."""
         return self.current_session_id
 
     def reset_session(self) -> str:
         """Reset the session by creating a new session ID."""
-        self.current_session_id = str(uuid.uuid4())
+        self.current_session_id = _new_session_id(self.unguessable_session_ids)
         logger.info(f"Reset to new session: {self.current_session_id}")
         return self.current_session_id
 
@@ -155,17 +292,17 @@ class FinancialAPIClient(APIClientInterface):
         """Create a new session using the API endpoint."""
         url = f"{self.base_url}/sessions"  # Updated to match OpenAPI spec
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self._get_headers()) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    new_session_id = data.get("session_id")
-                    self.current_session_id = new_session_id
-                    logger.info(f"Created new API session: {new_session_id}")
-                    return new_session_id
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to create new session: {response.status} - {error_text}")
+        session = await self._get_http()
+        async with session.post(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                new_session_id = data.get("session_id")
+                self.current_session_id = new_session_id
+                logger.info(f"Created new API session: {new_session_id}")
+                return new_session_id
+            else:
+                error_text = await response.text()
+                raise Exception(f"Failed to create new session: {response.status} - {error_text}")
 
 class APIClientFactory:
     @staticmethod
@@ -207,4 +344,20 @@ def get_global_session_id() -> Optional[str]:
 async def create_new_global_session() -> str:
     """Create a new session using the API endpoint."""
     client = _get_global_client()
-    return await client.create_new_session()
\ No newline at end of file
+    return await client.create_new_session()
+
+def run_in_background(coro) -> concurrent.futures.Future:
+    """Run a coroutine on the global client's background loop."""
+    client = _get_global_client()
+    return client.run_coroutine(coro)
+
+async def close_global_client() -> None:
+    """Close the global client's HTTP session."""
+    if _global_client is not None:
+        await _global_client.aclose()
+
+@atexit.register
+def _close_global_client_at_exit() -> None:
+    """Close the global client's HTTP session and background loop on interpreter exit."""
+    if _global_client is not None:
+        asyncio.run(_global_client.aclose())
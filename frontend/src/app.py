@@ -1,33 +1,61 @@
 import streamlit as st
 import os
-import asyncio
 from api_client import (
     get_response, 
     get_streaming_response, 
-    get_global_session_id, 
     reset_global_session,
-    create_new_global_session
+    create_new_global_session,
+    run_in_background
 )
 from dotenv import load_dotenv
-import threading
+from collections import deque
 import queue
 
+# Static entrance page content, each sent as a single element
+_DEMO_MD = """\
+# 🏦 GAgent: Financial Services Agent
+### Welcome to the Financial AI Demo
+*This is a demonstration of our AI-powered financial advisor*
+"""
+
+_DEMO_FEATURES_MD = """\
+---
+
+**Demo Features:**
+
+- Real-time AI financial advice
+- Streaming responses
+- Session management
+- No registration required
+"""
+
+@st.cache_resource(show_spinner=False)
+def _get_streamlit_port() -> int:
+    """
+    Load .env and read the port once per server process. Streamlit
+    re-executes this script on every rerun, so module-level code would
+    run again each time; the resource cache persists across reruns.
+    """
+    load_dotenv()
+    return int(os.getenv("STREAMLIT_PORT", 8501))
+
 class ChatApp:
+    __slots__ = ("port", "use_streaming")
+
     def __init__(self, use_streaming: bool = True):
-        load_dotenv()
-        self.port = int(os.getenv("STREAMLIT_PORT", 8501))
+        self.port = _get_streamlit_port()
         self.use_streaming = use_streaming
         self._initialize_session_state()
         self._setup_page_config()
 
     def _initialize_session_state(self) -> None:
         """Initialize the chat history and other state in session state."""
-        if "messages" not in st.session_state:
-            st.session_state["messages"] = []
-        if "api_session_initialized" not in st.session_state:
-            st.session_state["api_session_initialized"] = False
-        if "demo_authenticated" not in st.session_state:
-            st.session_state["demo_authenticated"] = False
+        ss = st.session_state
+        # Only the most recent messages are kept, bounding the per-rerun
+        # render of the history
+        ss.setdefault("messages", deque(maxlen=int(os.getenv("MAX_HISTORY", 200))))
+        ss.setdefault("api_session_initialized", False)
+        ss.setdefault("demo_authenticated", False)
 
     def _setup_page_config(self) -> None:
         """Configure the Streamlit page settings."""
@@ -42,9 +70,7 @@ class ChatApp:
         if st.session_state.get("demo_authenticated", False):
             return True
             
-        st.title("🏦 GAgent: Financial Services Agent")
-        st.markdown("### Welcome to the Financial AI Demo")
-        st.markdown("*This is a demonstration of our AI-powered financial advisor*")
+        st.markdown(_DEMO_MD)
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
@@ -52,12 +78,7 @@ class ChatApp:
                 st.session_state["demo_authenticated"] = True
                 st.rerun()
         
-        st.markdown("---")
-        st.markdown("**Demo Features:**")
-        st.markdown("- Real-time AI financial advice")
-        st.markdown("- Streaming responses")
-        st.markdown("- Session management")
-        st.markdown("- No registration required")
+        st.markdown(_DEMO_FEATURES_MD)
         
         return False
 
@@ -65,27 +86,25 @@ class ChatApp:
         """Initialize API session automatically."""
         if not st.session_state.get("api_session_initialized", False):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    new_session_id = loop.run_until_complete(create_new_global_session())
-                    st.session_state["api_session_initialized"] = True
-                    st.success(f"Connected to API! Session: {new_session_id[:8]}...")
-                finally:
-                    loop.close()
+                new_session_id = run_in_background(create_new_global_session()).result()
+                st.session_state["api_session_initialized"] = True
+                st.session_state["session_id_short"] = f"{new_session_id[:8]}..."
+                st.success(f"Connected to API! Session: {st.session_state['session_id_short']}")
             except Exception as e:
                 st.error(f"Failed to initialize API session: {str(e)}")
 
     def _display_chat_history(self) -> None:
         """Display all messages from the chat history."""
-        for message in st.session_state["messages"]:
+        ss = st.session_state
+        for message in ss["messages"]:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
     def _handle_user_input(self, user_input: str) -> None:
         """Handle user input and generate response."""
+        ss = st.session_state
         # Add user message to session state
-        st.session_state["messages"].append({"role": "user", "content": user_input})
+        ss["messages"].append({"role": "user", "content": user_input})
         with st.chat_message("user"):
             st.markdown(user_input)
         
@@ -101,70 +120,72 @@ class ChatApp:
                     # Use non-streaming response (backward compatibility)
                     response = get_response(user_input)
                     response_placeholder.markdown(response)
-                    st.session_state["messages"].append({"role": "assistant", "content": response})
+                    ss["messages"].append({"role": "assistant", "content": response})
             except Exception as e:
                 error_msg = str(e)
                 st.error(f"Error: {error_msg}")
                 response_placeholder.markdown(f"❌ Error: {error_msg}")
     
     def _handle_streaming_response(self, user_input: str, placeholder) -> None:
-        """Handle streaming response with real-time updates using a queue-based approach."""
-        full_response = ""
-        response_queue = queue.Queue()
-        error_occurred = False
+        """Handle streaming response, rendered by st.write_stream from a queue fed in the background."""
+        response_queue = queue.SimpleQueue()
+        error = None
         
-        def run_async_streaming():
-            """Run the async streaming in a separate thread."""
-            nonlocal error_occurred
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
+        async def stream_chunks():
+            """Stream the response on the client's background loop."""
+            sentinel = ('error', "Response stream was cancelled")
             try:
-                async def stream_chunks():
-                    async for chunk in get_streaming_response(user_input):
-                        response_queue.put(('chunk', chunk))
-                    response_queue.put(('done', None))
-                
-                loop.run_until_complete(stream_chunks())
+                async for chunk in get_streaming_response(user_input):
+                    response_queue.put(('chunk', chunk))
+                sentinel = ('done', None)
             except Exception as e:
-                error_occurred = True
-                response_queue.put(('error', str(e)))
+                sentinel = ('error', str(e))
             finally:
-                loop.close()
+                # Always end the stream, even on cancellation, so the
+                # script thread never waits on the queue forever
+                response_queue.put(sentinel)
         
-        # Start streaming in a separate thread
-        thread = threading.Thread(target=run_async_streaming)
-        thread.start()
-        
-        # Process chunks as they arrive
-        while True:
-            try:
-                # Check for new chunks with a timeout
-                message_type, content = response_queue.get(timeout=0.1)
+        def queued_chunks():
+            """
+            Yield chunks as they arrive until a done/error sentinel. Chunks
+            that queued up while the previous one was rendering are joined
+            into one, since each render resends the whole response.
+            """
+            nonlocal error
+            while True:
+                batch = [response_queue.get()]
+                while not response_queue.empty():
+                    batch.append(response_queue.get_nowait())
                 
-                if message_type == 'chunk':
-                    full_response += content
-                    placeholder.markdown(full_response)
-                elif message_type == 'done':
-                    break
-                elif message_type == 'error':
-                    full_response = f"Error: {content}"
-                    placeholder.markdown(full_response)
-                    break
-                    
-            except queue.Empty:
-                # No new chunks yet, continue waiting
-                continue
+                text = "".join(content for message_type, content in batch if message_type == 'chunk')
+                if text:
+                    yield text
+                
+                # The sentinel is always the last item put on the queue
+                message_type, content = batch[-1]
+                if message_type == 'error':
+                    error = content
+                    return
+                if message_type == 'done':
+                    return
+        
+        # Start streaming on the persistent background loop; the done/error
+        # sentinels are the completion signal, so the future isn't waited on
+        run_in_background(stream_chunks())
+        full_response = placeholder.write_stream(queued_chunks())
         
-        # Wait for thread to complete
-        thread.join()
+        if error is not None:
+            # Keep the error in the history so it is still shown after a rerun
+            full_response = f"⚠️ Error: {error}"
+            placeholder.markdown(full_response)
         
         # Add the complete response to session state
-        if full_response and not error_occurred:
+        if full_response:
             st.session_state["messages"].append({"role": "assistant", "content": full_response})
 
     def _render_sidebar_controls(self):
         """Render sidebar controls."""
+        ss = st.session_state
         with st.sidebar:
             st.markdown("---")
             st.header("⚙️ Chat Settings")
@@ -174,9 +195,11 @@ class ChatApp:
             
             # Session management
             st.subheader("📱 Session Info")
-            session_id = get_global_session_id()
-            if session_id:
-                st.info(f"Session ID: {session_id[:8]}...")
+            # The truncated ID is stored when a session is created, so the
+            # sidebar doesn't query the client on every rerun
+            session_id_short = ss.get("session_id_short")
+            if session_id_short:
+                st.info(f"Session ID: {session_id_short}")
             else:
                 st.warning("No active session")
             
@@ -185,39 +208,37 @@ class ChatApp:
             with col1:
                 if st.button("🔄 New Session", use_container_width=True):
                     try:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        try:
-                            new_session = loop.run_until_complete(create_new_global_session())
-                            st.session_state["messages"] = []  # Clear local chat history
-                            st.success(f"New session: {new_session[:8]}...")
-                            st.rerun()
-                        finally:
-                            loop.close()
+                        new_session = run_in_background(create_new_global_session()).result()
+                        ss["messages"].clear()  # Clear local chat history
+                        ss["session_id_short"] = f"{new_session[:8]}..."
+                        st.success(f"New session: {ss['session_id_short']}")
+                        st.rerun()
                     except Exception as e:
                         st.error(f"Failed to create new session: {str(e)}")
             
             with col2:
+                # The sidebar renders before the chat history, so clearing
+                # here takes effect in this run without another rerun
                 if st.button("🗑️ Clear Chat", use_container_width=True):
-                    st.session_state["messages"] = []
-                    st.success("Chat history cleared!")
-                    st.rerun()
+                    ss["messages"].clear()
+                    st.toast("Chat history cleared!")
             
             # Demo controls
             st.markdown("---")
             if st.button("🚪 Exit Demo", use_container_width=True):
                 # Reset everything for demo exit
-                st.session_state["demo_authenticated"] = False
-                st.session_state["api_session_initialized"] = False
-                st.session_state["messages"] = []
+                ss["demo_authenticated"] = False
+                ss["api_session_initialized"] = False
+                ss["messages"].clear()
+                ss.pop("session_id_short", None)
                 reset_global_session()
                 st.rerun()
             
             # Debug info
             with st.expander("🔧 Debug Info"):
-                st.write("**Demo Status:**", "✅ Authenticated" if st.session_state.get("demo_authenticated") else "❌ Not authenticated")
-                st.write("**API Session:**", "✅ Initialized" if st.session_state.get("api_session_initialized") else "❌ Not initialized")
-                st.write("**Messages Count:**", len(st.session_state.get("messages", [])))
+                st.write("**Demo Status:**", "✅ Authenticated" if ss.get("demo_authenticated") else "❌ Not authenticated")
+                st.write("**API Session:**", "✅ Initialized" if ss.get("api_session_initialized") else "❌ Not initialized")
+                st.write("**Messages Count:**", len(ss.get("messages", [])))
 
     def run(self) -> None:
         """Run the chat application."""
@@ -243,7 +264,14 @@ class ChatApp:
         
         # Main chat interface
         st.markdown("---")
-        
+        self._render_chat()
+
+    @st.fragment
+    def _render_chat(self) -> None:
+        """
+        Render the chat history and input as a fragment, so sending a
+        message reruns only the chat area rather than the whole page.
+        """
         # Display chat history
         self._display_chat_history()
         
@@ -254,8 +282,12 @@ class ChatApp:
 def main() -> None:
     """Main function to run the chat application."""
     try:
-        chat_app = ChatApp()
-        chat_app.run()
+        # Build the app once per user session; Streamlit keeps the page
+        # config from the first run, so later reruns skip __init__ entirely
+        ss = st.session_state
+        if "chat_app" not in ss:
+            ss["chat_app"] = ChatApp()
+        ss["chat_app"].run()
     except Exception as e:
         st.error(f"Application error: {str(e)}")
         st.info("Please check your environment variables and try refreshing the page.")
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from aiohttp import web
+
+from src import api_client
+from src.api_client import FinancialAPIClient
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _frame(message_type: str, content: str) -> bytes:
+    """Encode one SSE data frame the way the backend sends it."""
+    return b"data: " + json.dumps({"type": message_type, "content": content}, ensure_ascii=False).encode() + b"\n\n"
+
+
+class FakeContent:
+    """Stands in for aiohttp's StreamReader, returning the given reads in order."""
+
+    def __init__(self, reads):
+        self._reads = reads
+
+    async def iter_any(self):
+        for read in self._reads:
+            yield read
+
+
+class FakeResponse:
+    def __init__(self, reads):
+        self.content = FakeContent(reads)
+
+
+@pytest.fixture(params=["json", "orjson"])
+def client(request, monkeypatch):
+    """A client parsing frames with each available JSON library."""
+    if request.param == "orjson":
+        if orjson is None:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(api_client, "json_loads", orjson.loads)
+    else:
+        monkeypatch.setattr(api_client, "json_loads", json.loads)
+    return FinancialAPIClient(base_url="http://127.0.0.1:1")
+
+
+def _stream(client, reads):
+    """Collect the content a client yields for a sequence of reads."""
+    async def collect():
+        return [chunk async for chunk in client._handle_response_stream(FakeResponse(reads), None)]
+    return asyncio.run(collect())
+
+
+def test_frames_split_across_reads(client):
+    """Test frames split mid-prefix, mid-payload and mid-UTF-8 are reassembled"""
+    data = _frame("assistant_response", "Hello ") + _frame("assistant_response", "→ world")
+    arrow = data.index("→".encode())
+    reads = [data[:2], data[2:10], data[10:arrow + 1], data[arrow + 1:]]
+
+    assert _stream(client, reads) == ["Hello ", "→ world"]
+
+
+def test_crlf_terminated_frames(client):
+    """Test frames terminated by \\r\\n parse the same as \\n"""
+    data = _frame("assistant_response", "Hello").replace(b"\n", b"\r\n")
+
+    assert _stream(client, [data]) == ["Hello"]
+
+
+def test_trailing_frame_without_newline(client):
+    """Test a final frame with no terminating newline is still yielded"""
+    data = _frame("assistant_response", "Hello") + _frame("assistant_response", "end").rstrip(b"\n")
+
+    assert _stream(client, [data]) == ["Hello", "end"]
+
+
+def test_done_and_unknown_frames_yield_nothing(client):
+    """Test done, unknown and malformed frames produce no content"""
+    data = _frame("done", "") + _frame("status", "thinking") + b"data: {not json\n\n"
+
+    assert _stream(client, [data]) == []
+
+
+def test_error_frame_raises(client):
+    """Test an error frame raises with the backend's message"""
+    data = _frame("assistant_response", "Hel") + _frame("error", "boom")
+
+    with pytest.raises(Exception, match="Stream error: boom"):
+        _stream(client, [data])
+
+
+@pytest.mark.parametrize("attempt", range(5))
+def test_backoff_stays_within_bounds(attempt):
+    """Test jittered backoff stays between half and all of the exponential delay"""
+    client = FinancialAPIClient(base_url="http://127.0.0.1:1", retry_delay=0.5)
+    ceiling = 0.5 * 2 ** attempt
+
+    for _ in range(200):
+        assert ceiling / 2 <= client._backoff(attempt) <= ceiling
+
+
+# ============================================================================
+# SESSION AND LOOP LIFECYCLE
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def api_url():
+    """A minimal chat API on an ephemeral port, served from its own thread."""
+    async def stream(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(_frame("assistant_response", "Hello"))
+        return response
+
+    started = threading.Event()
+    state = {}
+
+    def serve():
+        async def main():
+            app = web.Application()
+            app.router.add_post("/chat/stream", stream)
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            state["port"] = runner.addresses[0][1]
+            state["stop"] = asyncio.Event()
+            started.set()
+            await state["stop"].wait()
+            await runner.cleanup()
+        state["loop"] = asyncio.new_event_loop()
+        state["loop"].run_until_complete(main())
+        state["loop"].close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    yield f"http://127.0.0.1:{state['port']}"
+    state["loop"].call_soon_threadsafe(state["stop"].set)
+    thread.join()
+
+
+def test_aclose_after_get_response(api_url):
+    """Test aclose closes the background loop's session and stops the loop"""
+    client = FinancialAPIClient(base_url=api_url)
+
+    assert client.get_response("hi") == "Hello"
+    session, loop_thread = client._session, client._loop_thread
+
+    asyncio.run(client.aclose())
+
+    assert session.closed
+    assert client._session is None
+    assert client._loop is None
+    assert not loop_thread.is_alive()
+
+
+def test_switching_loops_closes_previous_session(api_url):
+    """Test the session of the background loop is closed when another loop takes over"""
+    client = FinancialAPIClient(base_url=api_url)
+
+    assert client.get_response("hi") == "Hello"
+    background_session = client._session
+
+    async def stream_and_close():
+        chunks = [chunk async for chunk in client.get_streaming_response("hi")]
+        assert background_session.closed
+        await client.aclose()
+        return chunks
+
+    assert asyncio.run(stream_and_close()) == ["Hello"]
@@ -94,7 +94,8 @@ def test_initialize_session_state(chat_app, mock_streamlit):
     """Test session state initialization."""
     chat_app._initialize_session_state()
     assert 'messages' in mock_streamlit['session_state']
-    assert mock_streamlit['session_state']['messages'] == []
+    assert list(mock_streamlit['session_state']['messages']) == []
+    assert mock_streamlit['session_state']['messages'].maxlen is not None
 
 def test_handle_user_input(chat_app, mock_streamlit, mock_api_client):
     """Test handling of user input."""
@@ -105,7 +106,7 @@ def test_handle_user_input(chat_app, mock_streamlit, mock_api_client):
     mock_streamlit['empty'].return_value = mock_placeholder
     
     # Mock the _handle_streaming_response method directly
-    with patch.object(chat_app, '_handle_streaming_response') as mock_handle_streaming:
+    with patch.object(ChatApp, '_handle_streaming_response') as mock_handle_streaming:
         # Setup the mock to update the session state
         def mock_handle_streaming_side_effect(user_input, placeholder):
             # Simulate the streaming response